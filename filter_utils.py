@@ -1,11 +1,16 @@
 """Utilities for building a filter file.
 
+Sentry payloads are handled as str and USBL log lines as bytes; callers
+decode (or not) once when reading the raw log, so nothing here converts.
+
 Authors: Genevieve Flaspohler and Victoria Preston
 Update: August 2022
 Contact: {geflaspo, vpreston}@mit.edu
 """
 
 import os
+import time
+import atexit
 
 def filter_sentry_status_message(message):
     """Strips the vehicle status message.
@@ -22,10 +27,7 @@ def filter_sentry_status_message(message):
         uint16 trackline
         bool abort_status
     """
-    try:
-        return message
-    except:
-        return None
+    return message
 
 
 def filter_sentry_science_message(message):
@@ -39,98 +41,190 @@ def filter_sentry_science_message(message):
         float32 ctd_salinity
         float32 paro_depth
     """
-    try:
-        packet = str(message).split(" ")
-        o2 = packet[0]
-        obs = packet[1]
-        orp = packet[2]
-        temp = packet[3]
-        salt = packet[4]
-        depth = packet[5]
-        return f"{o2},{obs},{orp},{temp},{salt},{depth}"
-    except:
+    # only the first six fields are used, so stop splitting after them
+    packet = message.split(" ", 6)
+    if len(packet) < 6:
         return None
+    # o2, obs, orp, temp, salt, depth
+    return ",".join(packet[:6])
 
 
 def filter_experimental_message(message):
     """Stand-in function for experimental sensors parsed in queue."""
-    return str(message)
+    return message
 
 def filter_supr_message(message):
     """Stand-in function for supr sensors parsed in queue."""
-    return str(message)
+    return message
 
 
 def filter_mets_message(message):
     """Stand-in function for supr sensors parsed in queue."""
-    return str(message)
+    return message
 
 def filter_obs_message(message):
     """Stand-in function for high sensitivity obs sensors parsed in queue."""
-    return str(message)
-
+    return message
+
+
+class SentryPayloadParser(object):
+    """Sorts SENTRY SDQ messages by the queue they were sent on."""
+
+    def __init__(self, status_queue, science_queue, experimental_queue, supr_queue, mets_queue, obs_queue):
+        """Initializes the parser.
+
+        Arguments:
+            status_queue (int): SDQ number for vehicle status
+            science_queue (int): SDQ number for scalar science
+            experimental_queue (int): SDQ number for experimental sensors
+            supr_queue (int): SDQ number for supr
+            mets_queue (int): SDQ number for mets
+            obs_queue (int): SDQ number for high sensitivity obs
+        """
+        self._kinds = {status_queue: "status",
+                       science_queue: "science",
+                       experimental_queue: "experimental",
+                       supr_queue: "supr",
+                       mets_queue: "mets",
+                       obs_queue: "obs"}
+
+    def parse_sentry_payload(self, message):
+        """Inspects the message and returns the message type.
+        One of "status", "science", "experimental", "supr", "mets", "obs", or None
+        Provide the message (str).
+        Returns message type, message payload, and cleaned timestamp.
+        """
+        _, sdq, body = message.partition("SDQ")
+        if not sdq:
+            return None, message, None
+
+        timestamp = message.partition("|")[0]
+
+        # Queue number sits between "SDQ " and the first ":"
+        queue, colon, payload = body.partition(":")
+        if not colon:
+            return None, message, timestamp
+        try:
+            queue = int(queue)
+        except ValueError:
+            return None, message, timestamp
 
-def parse_sentry_payload(message, status_queue, science_queue, experimental_queue, supr_queue, mets_queue, obs_queue):
-    """Inspects the message and returns the message type.
-    One of "status", "science", "experimental", or None
-    Provide the message and queue targets for status, science, and experimental.
-    Returns message type, message payload, and cleaned timestamp.
-    """
-    if not "SDQ" in message:
-        return None, message, None
-
-    payload = message[message.index("SDQ"):]
-    timestamp = message.split("|")[0]
-
-    # Starting from index 4 to remove leading "SDQ "
-    try:
-        queue = int(payload[4:payload.index(":")])
-        payload = payload[payload.index(":")+1:]
-        if queue == status_queue:
-            return "status", payload, timestamp
-        elif queue == science_queue:
-            return "science", payload, timestamp
-        elif queue == experimental_queue:
-            return "experimental", payload, timestamp
-        elif queue == supr_queue:
-            return "supr", payload, timestamp
-        elif queue == mets_queue:
-            return "mets", payload, timestamp
-        elif queue == obs_queue:
-            return "obs", payload, timestamp
-        else:
+        kind = self._kinds.get(queue)
+        if kind is None:
             return None, message, timestamp
-    except:
-        return None, message, timestamp
+        return kind, payload, timestamp
+
+
+def solution_tag(solution):
+    """Reduces a VFR solution field (e.g., b"SOLN_USBL") to its routing tag."""
+    if solution.startswith(b"SOLN_USBL"):
+        return b"USBL"
+    elif solution.startswith(b"SOLN_GPS0"):
+        return b"GPS0"
+    return None
 
 
-def parse_usbl_payload(message, file_targets, target_ids):
-    """Filters message of format:
-    VFR 2019/09/24 13:27:58.033 2 0 SOLN_USBL -125.079565 44.489675 -597.900 0.000 10 0.00 0.00
+class LogWriter(object):
+    """Appends lines to a set of log files, keeping each file open.
+
+    Lines are queued per file and written in one batch on flush(), or
+    once they have been held for flush_interval seconds or grow past
+    max_pending bytes.
     """
-    mess = str(message)
-    info_data = mess.split("|")[1]
-    packets = info_data.split(" ")
-    timestamp = mess.split("|")[0]
-    # extract relevant info
-    info = f"{timestamp},{packets[6]},{packets[7]},{packets[8]}"
-
-    if "VFR" in packets[0]:
-        for ft, tid in zip (file_targets, target_ids):
-            if "USBL" in str(packets[5]) or "GPS0" in str(packets[5]):
-                if packets[4] == str(tid):
-                    if os.path.isfile(ft):
-                        mode = "a"
-                    else:
-                        mode = "w+"
-                    with open(ft, mode) as rf:
-                        rf.write(f"{info}\n")
-                        rf.flush()
-                else:
-                    pass
-            else:
-                pass
-    else:
-        pass
-
-    return
\ No newline at end of file
+
+    def __init__(self, flush_interval=1.0, max_pending=1 << 20):
+        """Initializes an empty set of open files, flushed and closed at exit.
+
+        Arguments:
+            flush_interval (float): longest time (s) to hold queued lines
+            max_pending (int): most bytes to hold queued across all files
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._fds = {}
+        self._pending = {}
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+    def _open(self, path):
+        """Opens a file descriptor for appending and caches it."""
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._fds[path] = fd
+        return fd
+
+    def write(self, path, line):
+        """Queues a line (bytes, including the newline) for the file at path."""
+        pending = self._pending.get(path)
+        if pending is None:
+            pending = self._pending[path] = []
+        pending.append(line)
+        self._pending_bytes += len(line)
+        if self._pending_bytes >= self.max_pending or \
+                time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Writes all queued lines, with a single write per file."""
+        for path, pending in self._pending.items():
+            if not pending:
+                continue
+            fd = self._fds.get(path)
+            if fd is None:
+                fd = self._open(path)
+            data = memoryview(b"".join(pending))
+            while data:
+                data = data[os.write(fd, data):]
+            pending.clear()
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flushes and closes all of the open files."""
+        self.flush()
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+
+
+class UsblPayloadParser(object):
+    """Sorts USBL fixes into one file per target."""
+
+    def __init__(self, file_targets, target_ids):
+        """Initializes the parser.
+
+        Arguments:
+            file_targets (list(str)): files to write each target's fixes to
+            target_ids (list(int)): USBL ids matching each file target
+        """
+        self.file_targets = file_targets
+        self.target_ids = target_ids
+        self.writer = LogWriter()
+
+        # route (target id, solution tag) pairs straight to a file target
+        self._routes = {}
+        for ft, tid in zip(file_targets, target_ids):
+            for tag in (b"USBL", b"GPS0"):
+                self._routes[(str(tid).encode(), tag)] = ft
+
+    def flush(self):
+        """Writes out all fixes queued since the last flush."""
+        self.writer.flush()
+
+    def parse_usbl_payload(self, message):
+        """Filters a raw log line (as bytes) with payload of format:
+        VFR 2019/09/24 13:27:58.033 2 0 SOLN_USBL -125.079565 44.489675 -597.900 0.000 10 0.00 0.00
+        """
+        timestamp, _, info_data = message.partition(b"|")
+        if not info_data.startswith(b"VFR"):
+            return
+
+        # fields past depth (index 8) are unused, so stop splitting there
+        packets = info_data.split(b" ", 9)
+        ft = self._routes.get((packets[4], solution_tag(packets[5])))
+        if ft is None:
+            return
+
+        # extract relevant info
+        info = b"%b,%b,%b,%b\n" % (timestamp, packets[6], packets[7], packets[8])
+        self.writer.write(ft, info)
@@ -5,30 +5,23 @@ Update: August 2023
 Contact: {geflaspo, vpreston}@mit.edu
 """
 
+import io
 import os
+import mmap
 import time
+import hashlib
+import tempfile
 import utm
 import gsw
 import pandas as pd
 import numpy as np
-from scipy.interpolate import griddata
-
-from dash import Dash, html, dcc, callback, Output, Input
-import dash_bootstrap_components as dbc
-import dash
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.figure_factory as ff
-
-import matplotlib
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import matplotlib.animation as animation
-from matplotlib.widgets import Button
-from matplotlib import style
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # optional; pandas parses the files without it
+    pa_csv = None
 
-style.use('fivethirtyeight')
+import matplotlib.dates as mdates
 
 
 class CallbackXlim(object):
@@ -38,7 +31,7 @@ class CallbackXlim(object):
         self.callback_time = time.time()
 
     def __call__(self, event_ax):
-        xloc = matplotlib.dates.num2date(event_ax.xdata)
+        xloc = mdates.num2date(event_ax.xdata)
         self.obj.prev_xlim[self.idx] = self.obj.xlim[self.idx]
         self.obj.xlim[self.idx] = [xloc, None]
         self.obj.live_mode[self.idx] = False
@@ -59,6 +52,305 @@ class CallbackXlimArbitrary(object):
         self.obj.new_xlim[self.idx] = self.obj.xlim[self.idx]
 
 
+def read_csv_columns(source, read_options, column_types, include_columns):
+    """Reads columns of a CSV file with pyarrow, as a dict of arrays by column name.
+
+    Lines that do not have every column (e.g., a line still being written)
+    are skipped. pyarrow raises on a value that does not convert to its
+    column's type, where pandas would read it as missing; if so, the columns
+    are read again as text and converted with pandas, so that only the bad
+    values are lost.
+
+    Arguments:
+        source (str or file): file to read
+        read_options (ReadOptions): names of the columns
+        column_types (dict): pyarrow type of each column, by name; others
+            are inferred (as float64 once a value is bad)
+        include_columns (list(str)): columns to read
+    """
+    parse_options = pa_csv.ParseOptions(invalid_row_handler=lambda row: "skip")
+    try:
+        table = pa_csv.read_csv(source, read_options=read_options, parse_options=parse_options,
+                                convert_options=pa_csv.ConvertOptions(
+                                    column_types=column_types, include_columns=include_columns))
+        return {name: column.to_numpy() for name, column in zip(table.column_names, table.columns)}
+    except pa.ArrowInvalid:
+        if hasattr(source, "seek"):
+            source.seek(0)
+    text_types = dict.fromkeys(include_columns, pa.string())
+    table = pa_csv.read_csv(source, read_options=read_options, parse_options=parse_options,
+                            convert_options=pa_csv.ConvertOptions(
+                                column_types=text_types, include_columns=include_columns))
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        values = pd.Series(column.to_numpy(zero_copy_only=False))
+        kind = column_types.get(name, pa.float64())
+        if pa.types.is_timestamp(kind):
+            columns[name] = pd.to_datetime(values, errors="coerce").to_numpy()
+        elif pa.types.is_string(kind):
+            columns[name] = values.to_numpy()
+        else:
+            values = pd.to_numeric(values, errors="coerce")
+            if pa.types.is_floating(kind) or not values.hasnans:
+                values = values.astype(kind.to_pandas_dtype())
+            columns[name] = values.to_numpy()
+    return(columns)
+
+
+def read_csv_arrow(path, names, dtype=None, time_columns=None, usecols=None):
+    """Reads a headerless CSV file with pyarrow's multithreaded parser.
+
+    Arguments:
+        path (str or file): file to read
+        names (list(str)): names of the columns
+        dtype (dict): numpy dtype (e.g., "float32" or "str") of any column
+            that is not float64
+        time_columns (list(str)): columns holding timestamps
+        usecols (list(str)): columns to convert, if not all of them
+
+    Lines that do not have every column (e.g., a line still being written)
+    are skipped, and values that do not convert are missing.
+    """
+    if dtype is None:
+        dtype = {}
+    if time_columns is None:
+        time_columns = []
+    column_types = {}
+    for name in names:
+        if name in time_columns:
+            column_types[name] = pa.timestamp("ns")
+        else:
+            column_types[name] = pa.from_numpy_dtype(np.dtype(dtype.get(name, "float64")))
+    columns = read_csv_columns(path, pa_csv.ReadOptions(column_names=names), column_types,
+                               names if usecols is None else usecols)
+    return(pd.DataFrame(columns))
+
+
+def decimate(y, max_points=4000):
+    """Returns the positions of at most max_points values of y to plot.
+
+    y is split into max_points/2 runs, and the smallest and largest value of
+    each run are kept, so that spikes still show once plotted.
+
+    Arguments:
+        y (array): values to plot, in order
+        max_points (int): most values to keep
+    """
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return(np.arange(len(y)))
+    runs = max_points // 2
+    size = -(-len(y) // runs)  # values per run, rounded up
+    padded = np.full(runs * size, np.nan)
+    padded[:len(y)] = y
+    padded = padded.reshape(runs, size)
+    start = np.arange(runs) * size
+    lo = start + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    hi = start + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.unique(np.concatenate((lo, hi)))
+    return(keep[keep < len(y)])
+
+
+def outside_flags(values, mean, std, scale):
+    """Returns int8 flags of which values are at least scale stds from the mean.
+
+    Arguments:
+        values (array): values to classify
+        mean (float): mean of the values
+        std (float): standard deviation of the values
+        scale (float): number of standard deviations
+    """
+    diff = np.subtract(values, mean)
+    np.fabs(diff, out=diff)  # in place, so only one temporary is made
+    return(np.greater_equal(diff, std * scale).view(np.int8))
+
+
+def epoch_seconds(times):
+    """Returns the whole seconds since 1970 of datetime64[ns] times.
+
+    Missing times give NaN, so the seconds are only integers if every time
+    is present.
+
+    Arguments:
+        times (Series): times to convert
+    """
+    seconds = times.values.view(np.int64) // 10**9
+    if times.hasnans:
+        return(np.where(times.isna().values, np.nan, seconds))
+    return(seconds)
+
+
+def quiver_lines(x, y, u, v, scale=1., arrow_scale=0.3, angle=np.pi/9):
+    """Returns the x and y values of a quiver plot's lines, as drawn by ff.create_quiver.
+
+    Each barb is its start and end point, and each arrowhead its two side
+    points around the end point; every line is ended by a NaN. The barbs
+    come first, then the arrowheads.
+
+    Arguments:
+        x, y (array): start points of the arrows
+        u, v (array): x and y components of the arrows
+        scale (float): length of the arrows per unit of u and v
+        arrow_scale (float): length of the arrowhead per length of arrow
+        angle (float): angle (rad) between each side of the arrowhead and the arrow
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    end_x = x + scale * np.asarray(u, dtype=float)
+    end_y = y + scale * np.asarray(v, dtype=float)
+    arrow_len = arrow_scale * np.hypot(end_x - x, end_y - y)
+    barb_ang = np.arctan2(end_y - y, end_x - x)
+    empty = np.full(len(x), np.nan)
+    lines_x = np.concatenate((np.column_stack((x, end_x, empty)).ravel(),
+                              np.column_stack((end_x - arrow_len * np.cos(barb_ang + angle),
+                                               end_x,
+                                               end_x - arrow_len * np.cos(barb_ang - angle),
+                                               empty)).ravel()))
+    lines_y = np.concatenate((np.column_stack((y, end_y, empty)).ravel(),
+                              np.column_stack((end_y - arrow_len * np.sin(barb_ang + angle),
+                                               end_y,
+                                               end_y - arrow_len * np.sin(barb_ang - angle),
+                                               empty)).ravel()))
+    return(lines_x, lines_y)
+
+
+class FileTail(object):
+    """Reads the rows appended to a growing CSV file since the last read."""
+
+    def __init__(self, file):
+        """Initializes the tail at the start of the file.
+
+        Arguments:
+            file (str): filepointer to data
+        """
+        self.file = file
+        self.f = None  # the file, kept open once it exists
+        self.offset = 0  # byte offset just past the last complete line read
+        self.restarted = False  # whether the last read started over on a new file
+
+    def read(self, usecols, parse_dates=None, dtype=None):
+        """Returns the new complete lines as a dict of arrays, or None if there are none.
+
+        Arguments:
+            usecols (list(int)): columns to read, which key the arrays
+            parse_dates (list(int)): columns holding timestamps
+            dtype (dtype or dict): type of the other columns (by default
+                float64), or of each column by index
+        """
+        if parse_dates is None:
+            parse_dates = []
+        self.restarted = False
+        if not os.path.isfile(self.file):
+            return None
+        if self.f is not None and os.stat(self.file).st_ino != os.fstat(self.f.fileno()).st_ino:
+            # the file was replaced, so read the new one from its start
+            self.f.close()
+            self.f = None
+        if self.f is None:
+            self.f = open(self.file, "rb")
+            self.restarted = self.offset > 0
+            self.offset = 0
+        size = os.fstat(self.f.fileno()).st_size
+        if size < self.offset:
+            self.restarted = True  # truncated
+            self.offset = 0
+        if size <= self.offset:
+            return None
+
+        # map the file so only the new complete lines are copied out
+        with mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if self.offset > 0 and mm[self.offset - 1:self.offset] != b"\n":
+                self.restarted = True  # truncated and rewritten past the last read
+                self.offset = 0
+            # leave any partially written line for the next read
+            end = mm.rfind(b"\n", self.offset) + 1
+            if end == 0:
+                return None
+            chunk = mm[self.offset:end]
+        self.offset = end
+
+        if isinstance(dtype, dict):
+            dtypes = dtype
+        else:
+            dtypes = dict.fromkeys([col for col in usecols if col not in parse_dates],
+                                   np.float64 if dtype is None else dtype)
+        if pa_csv is None:
+            df = pd.read_csv(io.BytesIO(chunk), sep=",", header=None,
+                             usecols=usecols, parse_dates=parse_dates, dtype=dtypes)
+            return {col: df[col].to_numpy() for col in usecols}
+        column_types = {f"f{col}": pa.timestamp("ns") for col in parse_dates}
+        column_types.update({f"f{col}": pa.from_numpy_dtype(np.dtype(col_dtype))
+                             for col, col_dtype in dtypes.items()})
+        names = {f"f{col}": col for col in usecols}
+        columns = read_csv_columns(io.BytesIO(chunk),
+                                   pa_csv.ReadOptions(autogenerate_column_names=True),
+                                   column_types, list(names))
+        # straight to numpy, skipping a per-frame DataFrame
+        return {names[name]: values for name, values in columns.items()}
+
+
+class RingBuffer(object):
+    """Holds the most recent rows of a stream in preallocated arrays."""
+
+    def __init__(self, size, num_cols, x_dtype=float, y_dtype=float):
+        """Initializes an empty buffer.
+
+        Arguments:
+            size (int): maximum number of rows held
+            num_cols (int): number of y columns in each row
+            x_dtype (dtype): type of the x (e.g., time) values
+            y_dtype (dtype): type of the y values
+        """
+        self.size = size
+        self.x = np.empty(size, dtype=x_dtype)
+        self.y = np.empty((size, num_cols), dtype=y_dtype)
+        self.head = 0  # where the next row is written
+        self.count = 0  # number of rows held
+
+    def __len__(self):
+        return(self.count)
+
+    def clear(self):
+        """Empties the buffer."""
+        self.head = 0
+        self.count = 0
+
+    def extend(self, x, y, sort=False):
+        """Appends rows, overwriting the oldest rows once the buffer is full.
+
+        Arguments:
+            x (array): x values of the new rows
+            y (array): y values of the new rows, one column per y column
+            sort (bool): whether to keep the rows sorted by x
+        """
+        if sort and len(x) and (np.any(x[1:] < x[:-1]) or
+                                (self.count and x[0] < self.x[self.head-1])):
+            # rows arrived out of order, so re-sort everything held
+            old_x, old_y = self.view()
+            x = np.concatenate((old_x, x))
+            y = np.concatenate((old_y, y))
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+            self.head = self.count = 0
+
+        # only the most recent size rows can be kept
+        x, y = x[-self.size:], y[-self.size:]
+        n = len(x)
+        first = min(n, self.size - self.head)  # rows that fit before wrapping
+        self.x[self.head:self.head+first] = x[:first]
+        self.y[self.head:self.head+first] = y[:first]
+        self.x[:n-first] = x[first:]
+        self.y[:n-first] = y[first:]
+        self.head = (self.head + n) % self.size
+        self.count = min(self.count + n, self.size)
+
+    def view(self):
+        """Returns the held x and y values, oldest row first."""
+        if self.count < self.size:
+            return(self.x[:self.count], self.y[:self.count])
+        return(np.concatenate((self.x[self.head:], self.x[:self.head])),
+               np.concatenate((self.y[self.head:], self.y[:self.head])))
+
+
 class LiveTimePlot(object):
     """Creates a plot that live updates when data is written to file."""
 
@@ -74,6 +366,10 @@ class LiveTimePlot(object):
             scatter (bool): whether to connect points
             max_pts (int): maximum number of plotted points
         """
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+        from matplotlib.widgets import Button
+        plt.style.use('fivethirtyeight')
         self.fig = plt.figure()
         self.file = file
         self.time_index = time_index
@@ -82,9 +378,11 @@ class LiveTimePlot(object):
         self.num = len(col_index)  # number of subplots
         self.scatter = scatter
         self.max_pts = max_pts
-        self.axs = []
         self.callback_xlim = []
         self.callback_ylim = []
+        self.tail = FileTail(file)
+        # the most recent max_pts rows read from file
+        self.buffer = RingBuffer(max_pts, self.num, "datetime64[ns]", np.float32)
 
         # Initialize button
         buttonax = self.fig.add_axes([0.45, 0.9, 0.19, 0.075])
@@ -102,16 +400,51 @@ class LiveTimePlot(object):
         # Initialize date string format
         self.xfmt = mdates.DateFormatter("%H:%M:%S")
 
-        # Create the subplots and their callbacks
-        for i in range(1, self.num+1):
-            self.axs.append(self.fig.add_subplot(self.num, 1, i))
-            self.callback_xlim.append(CallbackXlim(self, i-1))
+        # Create the subplots, sharing the x axis, and their callbacks
+        self.axs = list(self.fig.subplots(
+            self.num, 1, sharex=True, squeeze=False)[:, 0])
+        for i in range(self.num):
+            self.callback_xlim.append(CallbackXlim(self, i))
 
-        # Create the refreshing plot
+        # Format the axes for the live time plot
+        for i, ax in enumerate(self.axs):
+            ax.xaxis.set_major_formatter(self.xfmt)
+            ax.xaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.yaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.set_title(self.col_names[i])
+        self._create_plots()
+
+        # Connect the Home button and click-to-zoom callbacks
+        self.button.on_clicked(self.callback_button)
+        self.fig.canvas.mpl_connect('button_press_event', self.callback_click)
+
+        # Create the refreshing plot, blitting only the plotted lines
         ani = animation.FuncAnimation(
-            self.fig, self.animate, interval=50, repeat=False)
+            self.fig, self.animate, interval=50, repeat=False, blit=True,
+            cache_frame_data=False)
         plt.show()
 
+    def _create_plots(self):
+        """Creates the plotted lines once; frames only update their data."""
+        self.plots = []
+        for ax in self.axs:
+            if self.scatter is False:
+                plot, = ax.plot([], [])
+            else:
+                plot, = ax.plot([], [], marker="o", linestyle="")
+            self.plots.append(plot)
+
+    def _get_views(self):
+        """Returns the current limits of every subplot."""
+        return([(ax.get_xlim(), ax.get_ylim()) for ax in self.axs])
+
+    def callback_click(self, event):
+        """Zooms every subplot in from where one of them was clicked."""
+        if event.inaxes not in self.axs:
+            return
+        for callback in self.callback_xlim:
+            callback(event)
+
     def callback_button(self, event_ax):
         """Resets the window viewing when the Home button is clicked."""
         self.button_time = time.time()
@@ -119,61 +452,71 @@ class LiveTimePlot(object):
         self.new_xlim = [None]*self.num
         self.new_ylim = [None]*self.num
 
+    def _spread(self, x, y, left, spreads):
+        """Returns the column minima and maxima of the rows right of left.
+
+        Arguments:
+            x (array): x values of the plotted rows
+            y (array): y values of the plotted rows
+            left (float): the zoomed left xlimit
+            spreads (dict): spreads already found this frame, by left xlimit
+        """
+        if left not in spreads:
+            # rows are sorted by time, so the visible rows are a slice
+            visible = y[np.searchsorted(x, left):]
+            spreads[left] = (np.nanmin(visible, axis=0),
+                             np.nanmax(visible, axis=0))
+        return(spreads[left])
+
     def animate(self, i):
         """How the plot should refresh over time."""
-        # Grab the data being written to file
-        if os.path.isfile(self.file):
-            lines = pd.read_csv(self.file, sep=",", header=None)
-            lines[self.time_index] = pd.to_datetime(lines[self.time_index],
-                                                    utc=True)
-            lines = lines.set_index(self.time_index).sort_index()
-
-            # Capture only the most recent max_pts
-            if len(lines) > self.max_pts:
-                lines = lines.tail(self.max_pts)
-
-            # Format the axes for the live time plot
-            for i, ax in enumerate(self.axs):
-                ax.clear()
-                ax.xaxis.set_major_formatter(self.xfmt)
-                ax.xaxis.set_major_locator(plt.MaxNLocator(10))
-                ax.yaxis.set_major_locator(plt.MaxNLocator(10))
-                ax.set_title(self.col_names[i])
+        # Grab the data written to file since the last refresh
+        new_lines = self.tail.read(usecols=[self.time_index] + list(self.col_index),
+                                   parse_dates=[self.time_index], dtype=np.float32)
+        if self.tail.restarted:
+            self.buffer.clear()
+        if new_lines is not None:
+            self.buffer.extend(new_lines[self.time_index],
+                               np.column_stack([new_lines[col] for col in self.col_index]),
+                               sort=True)
+
+        if len(self.buffer) > 0:
+            views = self._get_views()
 
             # Plot the time plots
-            time = lines.index
+            time, lines = self.buffer.view()
 
             # Use color to notify whether time stamp has dropped
-            if time[-1] == time[-2]:
+            if len(time) > 1 and time[-1] == time[-2]:
                 color = "r"
             else:
                 color = "b"
 
+            # Column spreads right of each zoomed left xlimit, found once
+            spreads = {}
             for i, ax in enumerate(self.axs):
-                if self.scatter is False:
-                    ax.plot(time, lines[self.col_index[i]], c=color)
-                else:
-                    ax.plot(time, lines[self.col_index[i]], c=color,
-                            marker="o", linestyle="")
+                self.plots[i].set_data(time, lines[:, i])
+                self.plots[i].set_color(color)
+                ax.relim()
+                ax.autoscale()
 
                 if self.new_xlim[i] is not None and not self.live_mode[i]:
                     # Set the new xlimit
                     ax.set_xlim(self.new_xlim[i])
 
                     # Compute the new y axis spread for all columns
-                    max_lim = lines[lines.index >=
-                                    self.new_xlim[i][0]].max(axis=0).values
-                    min_lim = lines[lines.index >=
-                                    self.new_xlim[i][0]].min(axis=0).values
-                    PAD = (max_lim - min_lim) * 0.05  # pad 5% of range
+                    left = pd.Timestamp(self.new_xlim[i][0]).tz_convert(None)
+                    min_lim, max_lim = self._spread(
+                        time, lines, left.to_datetime64(), spreads)
+                    PAD = (max_lim[i] - min_lim[i]) * 0.05  # pad 5% of range
                     # Set y limits with padding
-                    self.new_ylim[i] = (min_lim[i]-PAD[i], max_lim[i]+PAD[i])
+                    self.new_ylim[i] = (min_lim[i]-PAD, max_lim[i]+PAD)
                     ax.set_ylim(self.new_ylim[i])
 
-            self.button.on_clicked(self.callback_button)
-            for i, ax in enumerate(self.axs):
-                self.fig.canvas.mpl_connect(
-                    'button_press_event', self.callback_xlim[i])
+            # Blitting only redraws the lines, so redraw the axes if they moved
+            if self._get_views() != views:
+                self.fig.canvas.draw()
+        return(self.plots)
 
 
 class Live2DPlot(LiveTimePlot):
@@ -191,6 +534,10 @@ class Live2DPlot(LiveTimePlot):
                 scatter (bool): whether to connect points
                 max_pts (int): maximum number of plotted points
             """
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+        from matplotlib.widgets import Button
+        plt.style.use('fivethirtyeight')
         self.fig = plt.figure()
         self.file = file
         self.x_index = x_index
@@ -199,9 +546,14 @@ class Live2DPlot(LiveTimePlot):
         self.num = len(y_index)  # number of subplots
         self.scatter = scatter
         self.max_pts = max_pts
-        self.axs = []
         self.callback_xlim = []
         self.callback_ylim = []
+        self.tail = FileTail(file)
+        # the most recent max_pts rows read from file
+        # x can be any column (e.g., a time or position), so only y is float32
+        self.buffer = RingBuffer(max_pts, self.num, np.float64, np.float32)
+        self.dtypes = dict.fromkeys(self.y_index, np.float32)
+        self.dtypes[self.x_index] = np.float64
 
         # Initialize button
         buttonax = self.fig.add_axes([0.45, 0.9, 0.19, 0.075])
@@ -216,69 +568,85 @@ class Live2DPlot(LiveTimePlot):
         self.new_ylim = [None]*self.num
         self.button_time = time.time()
 
-        # Create the subplots and their callbacks
-        for i in range(1, self.num+1):
-            self.axs.append(self.fig.add_subplot(self.num, 1, i))
-            self.callback_xlim.append(CallbackXlimArbitrary(self, i-1))
+        # Create the subplots, sharing the x axis, and their callbacks
+        self.axs = list(self.fig.subplots(
+            self.num, 1, sharex=True, squeeze=False)[:, 0])
+        for i in range(self.num):
+            self.callback_xlim.append(CallbackXlimArbitrary(self, i))
 
-        # Create the refreshing plot
+        # Format the axes for the live plot
+        for i, ax in enumerate(self.axs):
+            ax.xaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.yaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.set_xlabel(self.ax_names[0])
+            ax.set_ylabel(self.ax_names[i+1])
+        self._create_plots()
+
+        # Connect the Home button and click-to-zoom callbacks
+        self.button.on_clicked(self.callback_button)
+        self.fig.canvas.mpl_connect('button_press_event', self.callback_click)
+
+        # Create the refreshing plot, blitting only the plotted lines
         ani = animation.FuncAnimation(
-            self.fig, self.animate, interval=50, repeat=False)
+            self.fig, self.animate, interval=50, repeat=False, blit=True,
+            cache_frame_data=False)
         plt.show()
 
+    def _spread(self, x, y, left, spreads):
+        """Returns the column minima and maxima of the rows right of left.
+
+        Arguments:
+            x (array): x values of the plotted rows, in the order read
+            y (array): y values of the plotted rows
+            left (float): the zoomed left xlimit
+            spreads (dict): spreads already found this frame, by left xlimit
+        """
+        if left not in spreads:
+            visible = y[x >= left]
+            spreads[left] = (np.nanmin(visible, axis=0),
+                             np.nanmax(visible, axis=0))
+        return(spreads[left])
+
     def animate(self, i):
         """How the plot should refresh over time."""
-        # Grab the data being written to file
-        if os.path.isfile(self.file):
-            lines = pd.read_csv(self.file, sep=",", header=None)
-            cols_to_keep = [self.x_index]
-            for y in self.y_index:
-                cols_to_keep.append(y)
-            lines = lines.loc[:, cols_to_keep]
-            lines = lines.set_index(self.x_index)
-
-            # Capture only the most recent max_pts
-            if len(lines) > self.max_pts:
-                lines = lines.tail(self.max_pts)
-
-            # Format the axes for the live time plot
-            for i, ax in enumerate(self.axs):
-                ax.clear()
-                ax.xaxis.set_major_locator(plt.MaxNLocator(10))
-                ax.yaxis.set_major_locator(plt.MaxNLocator(10))
-                ax.set_xlabel(self.ax_names[0])
-                ax.set_ylabel(self.ax_names[i+1])
+        # Grab the data written to file since the last refresh
+        new_lines = self.tail.read(usecols=[self.x_index] + list(self.y_index),
+                                   dtype=self.dtypes)
+        if self.tail.restarted:
+            self.buffer.clear()
+        if new_lines is not None:
+            self.buffer.extend(new_lines[self.x_index],
+                               np.column_stack([new_lines[col] for col in self.y_index]))
+
+        if len(self.buffer) > 0:
+            views = self._get_views()
 
             # Plot the time plots
-            x = lines.index
+            x, lines = self.buffer.view()
 
+            # Column spreads right of each zoomed left xlimit, found once
+            spreads = {}
             for i, ax in enumerate(self.axs):
-                if self.scatter is False:
-                    ax.plot(x, lines[self.y_index[i]])
-                else:
-                    ax.plot(x, lines[self.y_index[i]],
-                            marker="o", linestyle="")
+                self.plots[i].set_data(x, lines[:, i])
+                ax.relim()
+                ax.autoscale()
 
                 if self.new_xlim[i] is not None and not self.live_mode[i]:
                     # Set the new xlimit
                     ax.set_xlim(self.new_xlim[i])
 
                     # Compute the new y axis spread for all columns
-                    max_lim = lines[lines.index >=
-                                    self.new_xlim[i][0]].max(axis=0).values
-                    min_lim = lines[lines.index >=
-                                    self.new_xlim[i][0]].min(axis=0).values
-
-                    def PAD(ma, mi): return (ma - mi) * 0.05  # pad 5% of range
-                    pad = PAD(max_lim[i], min_lim[i])
+                    min_lim, max_lim = self._spread(
+                        x, lines, self.new_xlim[i][0], spreads)
+                    pad = (max_lim[i] - min_lim[i]) * 0.05  # pad 5% of range
                     # Set y limits with padding
                     self.new_ylim[i] = (min_lim[i]-pad, max_lim[i]+pad)
                     ax.set_ylim(self.new_ylim[i])
 
-            self.button.on_clicked(self.callback_button)
-            for i, ax in enumerate(self.axs):
-                self.fig.canvas.mpl_connect(
-                    'button_press_event', self.callback_xlim[i])
+            # Blitting only redraws the lines, so redraw the axes if they moved
+            if self._get_views() != views:
+                self.fig.canvas.draw()
+        return(self.plots)
 
 
 class LiveSpatialPlot(Live2DPlot):
@@ -298,6 +666,10 @@ class LiveSpatialPlot(Live2DPlot):
                 ax_names (list(str)): names of the data to plot
                 max_pts (int): maximum number of plotted points
             """
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+        from matplotlib.widgets import Button
+        plt.style.use('fivethirtyeight')
         self.fig = plt.figure()
         self.loc_file = loc_file
         self.data_file = data_file
@@ -308,8 +680,14 @@ class LiveSpatialPlot(Live2DPlot):
         self.ax_names = ax_names
         self.num = len(ax_names)  # number of subplots
         self.max_pts = max_pts
-        self.axs = []
         self.callback_reset = []
+        self.loc_tail = FileTail(loc_file)
+        self.data_tail = FileTail(data_file)
+        # the most recent max_pts locations read from file
+        self.locs = RingBuffer(max_pts, len(map_index), "datetime64[ns]")
+        # the data read from file since the oldest location
+        self.data_time = np.empty(0, dtype="datetime64[ns]")
+        self.data = np.empty((0, len(data_index)), dtype=np.float32)
 
         # Initialize button
         buttonax = self.fig.add_axes([0.45, 0.9, 0.19, 0.075])
@@ -324,70 +702,99 @@ class LiveSpatialPlot(Live2DPlot):
         self.new_ylim = [None]*self.num
         self.button_time = time.time()
 
-        # Create the subplots and their callbacks
-        for i in range(1, self.num+1):
-            self.axs.append(self.fig.add_subplot(self.num, 1, i))
-            self.callback_reset.append(CallbackXlimArbitrary(self, i-1))
+        # Create the subplots, sharing the map axes, and their callbacks
+        self.axs = list(self.fig.subplots(
+            self.num, 1, sharex=True, sharey=True, squeeze=False)[:, 0])
+        for i in range(self.num):
+            self.callback_reset.append(CallbackXlimArbitrary(self, i))
+
+        # Format the axes for the live spatial plot
+        for i, ax in enumerate(self.axs):
+            ax.xaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.yaxis.set_major_locator(plt.MaxNLocator(10))
+            ax.set_title(self.ax_names[i])
+        self._create_scatters()
 
         # Create the refreshing plot
         ani = animation.FuncAnimation(
-            self.fig, self.animate, interval=50, repeat=False)
+            self.fig, self.animate, interval=50, repeat=False,
+            cache_frame_data=False)
         plt.show()
 
+    def _create_scatters(self):
+        """Creates the scatters and their colorbars once; frames only update their data."""
+        from mpl_toolkits.axes_grid1 import make_axes_locatable
+        self.scats = []
+        for ax in self.axs:
+            scat = ax.scatter([], [], c=[], cmap="viridis")
+            divider = make_axes_locatable(ax)
+            cax = divider.append_axes('right', size='5%', pad=0.05)
+            self.fig.colorbar(scat, cax=cax, orientation='vertical')
+            self.scats.append(scat)
+
     def animate(self, i):
         """How the plot should refresh over time."""
-        # Grab the data being written to file
-        if os.path.isfile(self.loc_file):
-            locs = pd.read_csv(self.loc_file, sep=",", header=None)
-            locs[self.map_time_index] = pd.to_datetime(locs[self.map_time_index],
-                                                       utc=True)
-            cols_to_keep = [self.map_time_index]
-            for y in self.map_index:
-                cols_to_keep.append(y)
-            locs = locs.loc[:, cols_to_keep]
-            locs = locs.set_index(self.map_time_index).sort_index()
-            locs.columns = ["lat", "long", "depth"]
-
-        if os.path.isfile(self.data_file):
-            data = pd.read_csv(self.data_file, sep=",", header=None)
-            data[self.data_time_index] = pd.to_datetime(data[self.data_time_index],
-                                                        utc=True)
-            cols_to_keep = [self.data_time_index]
-            for y in self.data_index:
-                cols_to_keep.append(y)
-            data = data.loc[:, cols_to_keep]
-            data = data.set_index(self.data_time_index).sort_index()
-            data.columns = self.ax_names
-
-        merged = pd.merge_asof(locs, data, left_index=True, right_index=True)
-
-        # Capture only the most recent max_pts
-        if len(merged) > self.max_pts:
-            merged = merged.tail(self.max_pts)
+        # Grab the data written to file since the last refresh
+        new_locs = self.loc_tail.read(usecols=[self.map_time_index] + list(self.map_index),
+                                      parse_dates=[self.map_time_index])
+        if self.loc_tail.restarted:
+            self.locs.clear()
+        if new_locs is not None:
+            self.locs.extend(new_locs[self.map_time_index],
+                             np.column_stack([new_locs[col] for col in self.map_index]),
+                             sort=True)
+
+        new_data = self.data_tail.read(usecols=[self.data_time_index] + list(self.data_index),
+                                       parse_dates=[self.data_time_index], dtype=np.float32)
+        if self.data_tail.restarted:
+            self.data_time, self.data = self.data_time[:0], self.data[:0]
+        if new_data is not None:
+            data_time = np.concatenate(
+                (self.data_time, new_data[self.data_time_index]))
+            data = np.concatenate(
+                (self.data, np.column_stack([new_data[col] for col in self.data_index])))
+            if np.any(data_time[1:] < data_time[:-1]):
+                order = np.argsort(data_time, kind="stable")
+                data_time, data = data_time[order], data[order]
+            self.data_time, self.data = data_time, data
+
+        if len(self.locs) == 0 or len(self.data_time) == 0:
+            return
+        loc_time, locs = self.locs.view()
+
+        # Drop data older than needed to match the oldest location
+        first = max(np.searchsorted(self.data_time, loc_time[0], side="right") - 1, 0)
+        self.data_time, self.data = self.data_time[first:], self.data[first:]
+
+        # Match each location to the latest data at or before it
+        match = np.searchsorted(self.data_time, loc_time, side="right") - 1
+        values = self.data[np.maximum(match, 0)]
+        values[match < 0] = np.nan
 
-        # Format the axes for the live time plot
         for i, ax in enumerate(self.axs):
-            ax.clear()
-            ax.xaxis.set_major_locator(plt.MaxNLocator(10))
-            ax.yaxis.set_major_locator(plt.MaxNLocator(10))
-            ax.set_title(self.ax_names[i])
-
-            for i, ax in enumerate(self.axs):
-                scat = ax.scatter(merged["lat"],
-                                  merged["long"],
-                                  c=merged[self.ax_names[i]],
-                                  cmap="viridis")
+            points = locs[:, :2]  # lat, long
+            self.scats[i].set_offsets(points)
+            self.scats[i].set_array(values[:, i])
+            if not np.isnan(values[:, i]).all():
+                self.scats[i].autoscale()
 
-                from mpl_toolkits.axes_grid1 import make_axes_locatable
-                divider = make_axes_locatable(ax)
-                cax = divider.append_axes('right', size='5%', pad=0.05)
-                self.fig.colorbar(scat, cax=cax, orientation='vertical')
+            # Fit the view to the latest points
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(points)
+            ax.autoscale_view()
 
 
 class SentryDashboard(object):
     """Creates a plotly dashboard that updates with streamed data."""
 
     def __init__(self, sentryfile, sensorfile, metsfile, backscatterfile, usblfile, bathyfile, currentfile, keys, numkeys):
+        import dash
+        from dash import Dash, dcc, callback, Output, Input, State, Patch, ctx, no_update
+        from dash.exceptions import PreventUpdate
+        import dash_bootstrap_components as dbc
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
         self.datafile = sentryfile  # base case sentry data
         self.bathyfile = bathyfile  # bathy underlay
         self.keys = keys.split(",")  # keys to display on charts
@@ -396,6 +803,9 @@ class SentryDashboard(object):
         self.sensorfile = sensorfile  # experimental data
         if self.sensorfile == 'None':
             self.sensorfile = None
+        # SAGE columns to parse: those on the engineering page, and any keys
+        self.sage_columns = ["methane_ppm", "inletTemperature_C", "junctionTemperature_C",
+                             "housingPressure_mbar", "junctionHumidity_per", "avgPDVolts"] + self.keys
         self.metsfile = metsfile  # mets methane sensor data
         if self.metsfile == 'None':
             self.metsfile = None
@@ -410,42 +820,54 @@ class SentryDashboard(object):
             self.currentfile = None
         
 
+        self.file_cache = {}  # parsed data, by file, until the file changes
+        self.stats = {}  # statistics, by name and key, of self.stats_df
+        self.stats_df = None
+        self.thermo_cache = {}  # times, inputs, and outputs of the last thermo, by key
+
         # read in the initial sentry science and extra sensor data
         self.df = self.read_and_combine_dataframes(include_location=False)
         self.last_t = np.nanmax(self.df.t)
         self.last_current_t = np.nanmax(self.df.t)
+        self.data_mtimes = None  # file modification times when last read with locations
+        self.data_version = 0  # number of times the data has been re-read with locations
+        self.data_changes = {}  # earliest time of a read row each re-read changed, by version
+        self.timeline_points = 4000  # points in each timeline of a full figure
+        self.max_timeline_points = 8000  # points a timeline may be extended to before it is re-sent
+        self.timeline_layout = go.Layout(uirevision=True, font=dict(size=20),
+                                         hoverlabel=dict(font_size=20), margin=dict(t=60))
 
         # create a dictionary of sliders
         self.sliders = {}
         self.current_sliders = {}
+        limits = self.df[self.keys].agg(["min", "max"])  # one pass, skipping NaNs
         for key in self.keys:
-            self.sliders[key] = dcc.RangeSlider(np.nanmin(self.df[key]),
-                                                np.nanmax(self.df[key]),
-                                                value=[np.nanmin(self.df[key]), np.nanmax(self.df[key])],
+            keymin, keymax = limits.at["min", key], limits.at["max", key]
+            self.sliders[key] = dcc.RangeSlider(keymin,
+                                                keymax,
+                                                value=[keymin, keymax],
                                                 id='maptime-slider')
-            self.current_sliders[key] = dcc.RangeSlider(np.nanmin(self.df[key]),
-                                                        np.nanmax(self.df[key]),
-                                                        value=[np.nanmin(self.df[key]), np.nanmax(self.df[key])],
+            self.current_sliders[key] = dcc.RangeSlider(keymin,
+                                                        keymax,
+                                                        value=[keymin, keymax],
                                                         id='current-slider')
 
         # cache the bathy underlay in memory
         self.bathy = self.get_bathy_data()
-        self.bathy_3dplot = go.Mesh3d(x=self.bathy.lon[0::10],
-                                      y=self.bathy.lat[0::10],
-                                      z=self.bathy.depth[0::10],
-                                      intensity=self.bathy.depth[0::10],
+        # every tenth point, as contiguous arrays (depth needs no more than float32)
+        mesh_lon = self.bathy.lon.values[0::10].copy()
+        mesh_lat = self.bathy.lat.values[0::10].copy()
+        mesh_depth = self.bathy.depth.values[0::10].astype(np.float32)
+        self.bathy_3dplot = go.Mesh3d(x=mesh_lon,
+                                      y=mesh_lat,
+                                      z=mesh_depth,
+                                      intensity=mesh_depth,
                                       colorscale='Viridis',
                                       opacity=0.50,
                                       name="Bathy")
-        lonmin, lonmax = self.bathy.lon.min(), self.bathy.lon.max()
-        latmin, latmax = self.bathy.lat.min(), self.bathy.lat.max()
-        xlon = np.linspace(lonmin, lonmax, 200)
-        ylat = np.linspace(latmin, latmax, 200)
-        xlon, ylat = np.meshgrid(xlon, ylat)
-        Z = griddata((self.bathy.lon, self.bathy.lat),
-                     self.bathy.depth, (xlon, ylat), method="cubic")
-        self.bathy_2dplot = go.Contour(x=xlon[0],
-                                       y=ylat[:, 0],
+        xlon, ylat, Z = self.get_bathy_grid()
+        self.bathy_2dplot = go.Contour(x=xlon,
+                                       y=ylat,
                                        z=Z,
                                        contours=dict(
                                            start=-2800., end=-2000., size=20),
@@ -464,11 +886,11 @@ class SentryDashboard(object):
                                      name="Vents")
         vent_sites_easting, vent_sites_northing, _, _ = utm.from_latlon(
             np.asarray(vent_sites_lat), np.asarray(vent_sites_lon))
-        self.vents_m_plot = go.Scatter(x=vent_sites_easting,
-                                       y=vent_sites_northing,
-                                       mode="markers",
-                                       marker=dict(size=20, color="green"),
-                                       name="Vents")
+        self.vents_m_plot = go.Scattergl(x=vent_sites_easting,
+                                         y=vent_sites_northing,
+                                         mode="markers",
+                                         marker=dict(size=20, color="green"),
+                                         name="Vents")
         # moorings_lon = [-129.0823, -129.0875, -129.0989, -129.1067]
         # moorings_lat = [47.9737, 47.9747, 47.9334, 47.9355]
         moorings_lon = []  # [-129.0823, -129.0875]#, -129.0989, -129.1067]
@@ -503,22 +925,40 @@ class SentryDashboard(object):
         # create dashboard callbacks
         ############
 
-        # callback for quickview home page with autorefresh timelines
+        # callback for quickview home page with autorefresh timelines; like
+        # stream, only the new rows are sent once the page has the figure
         @callback(Output("graph-home-quickview", "figure"),
-                  Input("graph-home-update", "n_intervals"))
-        def plot_quickview(n):
-            self.df = self.read_and_combine_dataframes(include_location=True)
+                  Output("graph-home-sent", "data"),
+                  Input("graph-home-update", "n_intervals"),
+                  State("graph-home-sent", "data"))
+        def plot_quickview(n, sent):
+            self.df = self.read_latest()
+            keys = self.keys[:self.numkeys]
+            if n and sent is not None and not self.sent_rows_changed(sent):
+                new_df = self.rows_after(sent["t"])
+                if len(new_df) == 0:
+                    raise PreventUpdate
+                points = sent["points"] + len(new_df)
+                if points <= self.max_timeline_points:
+                    x = new_df.index.tolist()
+                    hover = new_df[["lat", "lon", "Depth"]].values.tolist()
+                    patch = Patch()
+                    for i, key in enumerate(keys):
+                        patch["data"][i]["x"].extend(x)
+                        patch["data"][i]["y"].extend(new_df[key].tolist())
+                        patch["data"][i]["customdata"].extend(hover)
+                    return(patch, self.sent_state(points))
+            sent = self.sent_state(min(len(self.df), self.timeline_points))
+
             time_plots = make_subplots(rows=self.numkeys, cols=1, shared_xaxes=True, vertical_spacing=0.025, subplot_titles=self.keys)
-            for i in range(0, self.numkeys):
-                time_plots.add_trace(go.Scatter(x=self.df.index,
-                                                y=self.df[self.keys[i]],
-                                                mode="lines",
-                                                name=self.keys[i],), row=i+1, col=1)
+            for i, key in enumerate(keys):
+                time_plots.add_trace(self.timeline_trace(self.df[key], name=key), row=i+1, col=1)
             time_plots.update_layout(
                 height=1900, uirevision=True, showlegend=False, margin=dict(t=20), font=dict(size=20), hoverlabel=dict(font_size=20))
-            return(time_plots)
+            return(time_plots, sent)
 
-        # callback for main page/autorefreshing timelines
+        # callback for main page/autorefreshing timelines; a freshly loaded
+        # page gets full figures, after which only the new rows are sent
         @callback(Output("graph-content-turbidity", "figure"),
                   Output("graph-content-orp", "figure"),
                   Output("graph-content-depth", "figure"),
@@ -528,59 +968,42 @@ class SentryDashboard(object):
                   Output("graph-content-temperature", "figure"),
                   Output("graph-content-salinity", "figure"),
                   Output("graph-content-oxygen", "figure"),
-                  Input("graph-update", "n_intervals"))
-        def stream(n):
-            self.df = self.read_and_combine_dataframes(include_location=True)
-            figturb = px.line(self.df, x=self.df.index, y=self.df.Turbidity,  hover_data=[
-                              "lat", "lon", "Depth"])
-            figturb.update_layout(uirevision=True, font=dict(size=20))
-            figorp = px.line(self.df, x=self.df.index,
-                             y=self.df.ORP, hover_data=["lat", "lon", "Depth"])
-            figorp.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            figtemp = px.line(self.df, x=self.df.index, y=self.df.Temperature, hover_data=[
-                              "lat", "lon", "Depth"])
-            figtemp.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            if self.sensorfile is not None:
-                figmethane = px.line(self.df, x=self.df.index, y=self.df.methane_ppm, hover_data=[
-                                     "lat", "lon", "Depth"], markers=True)
-                figmethane.update_layout(uirevision=True, font=dict(
-                    size=20), hoverlabel=dict(font_size=20))
-            else:
-                figmethane = px.line(
-                    x=self.df.index, y=np.zeros_like(self.df.t))
-                figmethane.update_layout(uirevision=True, font=dict(size=20))
+                  Output("graph-update-sent", "data"),
+                  Input("graph-update", "n_intervals"),
+                  State("graph-update-sent", "data"))
+        def stream(n, sent):
+            self.df = self.read_latest()
+
+            # extend the page's timelines with the rows it has not been sent,
+            # unless late data has changed the rows it already has or the
+            # timelines would grow past the cap, when they are sent decimated
+            if n and sent is not None and not self.sent_rows_changed(sent):
+                new_df = self.rows_after(sent["t"])
+                if len(new_df) == 0:
+                    raise PreventUpdate
+                points = sent["points"] + len(new_df)
+                if points <= self.max_timeline_points:
+                    patches = self.extend_timelines(new_df)
+                    return(tuple(patches) + (self.sent_state(points),))
+            sent = self.sent_state(min(len(self.df), self.timeline_points))
+
+            figturb = self.timeline_figure(self.df.Turbidity)
+            figorp = self.timeline_figure(self.df.ORP)
+            figtemp = self.timeline_figure(self.df.Temperature)
             if self.metsfile is not None:
-                figmethane = px.line(self.df, x=self.df.index, y=self.df.methane_mets, hover_data=[
-                                     "lat", "lon", "Depth"], markers=True)
-                figmethane.update_layout(uirevision=True, font=dict(
-                    size=20), hoverlabel=dict(font_size=20))
+                figmethane = self.timeline_figure(self.df.methane_mets, markers=True)
             else:
-                figmethane = px.line(
-                    x=self.df.index, y=np.zeros_like(self.df.t))
-                figmethane.update_layout(uirevision=True, font=dict(size=20))
-            figdepth = px.line(self.df, x=self.df.index, y=-self.df.Depth, hover_data=[
-                               "lat", "lon", "Depth"])
-            figdepth.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            figo2 = px.line(self.df, x=self.df.index, y=self.df.Oxygen, hover_data=[
-                            "lat", "lon", "Depth"])
-            figo2.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            figsalt = px.line(self.df, x=self.df.index, y=self.df.Salinity, hover_data=[
-                              "lat", "lon", "Depth"])
-            figsalt.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            figpotden = px.line(self.df, x=self.df.index, y=-self.df.potential_density, hover_data=[
-                "lat", "lon", "Depth"])
-            figpotden.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            figspice = px.line(self.df, x=self.df.index, y=self.df.spice, hover_data=[
-                "lat", "lon", "Depth"])
-            figspice.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            return(figturb, figorp, figmethane, figdepth, figpotden, figspice, figtemp, figsalt, figo2)
+                flat = decimate(np.zeros(len(self.df)), self.timeline_points)
+                figmethane = go.Figure(go.Scattergl(x=self.df.index[flat],
+                                                    y=np.zeros(len(flat)),
+                                                    mode="lines"),
+                                       layout=self.timeline_layout)
+            figdepth = self.timeline_figure(-self.df.Depth)
+            figo2 = self.timeline_figure(self.df.Oxygen)
+            figsalt = self.timeline_figure(self.df.Salinity)
+            figpotden = self.timeline_figure(-self.df.potential_density)
+            figspice = self.timeline_figure(self.df.spice)
+            return(figturb, figorp, figdepth, figmethane, figpotden, figspice, figtemp, figsalt, figo2, sent)
 
         # callback for SAGE engineering page
         @callback(Output("graph-content-sage", "figure"),
@@ -619,24 +1042,26 @@ class SentryDashboard(object):
                   Input("c-axis-selection", "value"),
                   Input("anomaly-control", "value"))
         def plot_thresholds(xval, yval, cval, sdscale):
-            # compute standard deviation and mean
-            df_copy = self.read_and_combine_dataframes(include_location=True)
+            # plot from a small frame of just the columns the figures use
+            df = self.read_latest()
+            columns = [xval, yval, "lat", "lon", "Depth"]
+            if cval != "Anomaly":
+                columns.append(cval)
+            df_copy = pd.DataFrame({col: df[col].values for col in columns},
+                                   index=df.index)
 
             if cval == "Anomaly":
-                xvalmean, xvalstd = df_copy[xval].mean(), df_copy[xval].std()
-                yvalmean, yvalstd = df_copy[yval].mean(), df_copy[yval].std()
+                # compute standard deviation and mean
+                xvalmean, xvalstd = self.get_stats(xval)
+                yvalmean, yvalstd = self.get_stats(yval)
 
                 # classify data based on standard deviation threshold
-                df_copy.loc[:, f"{xval}_meandiff"] = df_copy.apply(
-                    lambda x: np.fabs(x[xval] - xvalmean), axis=1)
-                df_copy.loc[:,
-                            f"{xval}_outside"] = (df_copy[f"{xval}_meandiff"] >= xvalstd * sdscale).astype(float)
-                df_copy.loc[:, f"{yval}_meandiff"] = df_copy.apply(
-                    lambda x: np.fabs(x[yval] - yvalmean), axis=1)
-                df_copy.loc[:,
-                            f"{yval}_outside"] = (df_copy[f"{yval}_meandiff"] >= yvalstd * sdscale).astype(float)
-                df_copy.loc[:, f"Anomaly"] = df_copy[f"{yval}_outside"].astype(
-                    float) + df_copy[f"{xval}_outside"].astype(float)
+                # as 0/1 flags, which are 1/8 the size of floats to send
+                xoutside = outside_flags(df_copy[xval].values, xvalmean, xvalstd, sdscale)
+                youtside = outside_flags(df_copy[yval].values, yvalmean, yvalstd, sdscale)
+                df_copy[f"{xval}_outside"] = xoutside
+                df_copy[f"{yval}_outside"] = youtside
+                df_copy["Anomaly"] = youtside + xoutside
 
             # create plots
             fig = px.scatter(df_copy, x=xval, y=yval, color=cval, marginal_x="violin",
@@ -666,7 +1091,11 @@ class SentryDashboard(object):
         def plot_maps(vtarg):
             """Render the maps on the maps page."""
             # get the usbl relevant data
-            map_df = self.read_and_combine_dataframes(include_location=True)
+            map_df = self.read_latest()
+            # both maps share one colour range, the 10th to 90th percentiles
+            cmin, cmax = self.get_color_range(vtarg)
+            # keep every nth row, so each map has at most 50000 markers to draw
+            map_df = map_df.iloc[::max(1, -(-len(map_df) // 50000))]
             map_plots = make_subplots(rows=1, cols=2, specs=[
                                       [{"type": "scatter3d"}, {"type": "scatter3d"}]])
             map_plots.add_trace(self.bathy_3dplot, row=1, col=1)
@@ -678,10 +1107,8 @@ class SentryDashboard(object):
                                                          color=map_df[vtarg],
                                                          opacity=0.7,
                                                          colorscale="Inferno",
-                                                         cmin=np.nanpercentile(
-                                                             map_df[vtarg], 10),
-                                                         cmax=np.nanpercentile(
-                                                             map_df[vtarg], 90),
+                                                         cmin=cmin,
+                                                         cmax=cmax,
                                                          colorbar=dict(thickness=30, x=-0.1)),
                                              hovertext=map_df.index,
                                              hoverinfo="name+x+y+z+text"), row=1, col=1)
@@ -693,10 +1120,8 @@ class SentryDashboard(object):
                                                          color=map_df[vtarg],
                                                          opacity=0.7,
                                                          colorscale="Inferno",
-                                                         cmin=np.nanpercentile(
-                                                             map_df[vtarg], 10),
-                                                         cmax=np.nanpercentile(
-                                                             map_df[vtarg], 90),
+                                                         cmin=cmin,
+                                                         cmax=cmax,
                                                          colorbar=dict(thickness=30, x=-0.1)),
                                              hovertext=map_df.index,
                                              hoverinfo="name+x+y+z+text"), row=1, col=2)
@@ -709,12 +1134,13 @@ class SentryDashboard(object):
                   Input("maptime-slider-time", "value"))
         def update_maptime_time_slider(n, tlims):
             slide_max = tlims[-1]
-            self.df = self.read_and_combine_dataframes(include_location=True)
+            self.df = self.read_latest()
+            tmin, tmax = self.df.t.values[[0, -1]]  # the data is sorted by t
             if slide_max >= self.last_t:
-                self.last_t = np.nanmax(self.df.t)
-                return(np.nanmin(self.df.t), np.nanmax(self.df.t), [tlims[0], np.nanmax(self.df.t)])
+                self.last_t = tmax
+                return(tmin, tmax, [tlims[0], tmax])
             else:
-                return(np.nanmin(self.df.t), np.nanmax(self.df.t), tlims)
+                return(tmin, tmax, tlims)
         
 
         @callback(Output("maptime-rangeslider-slider", "children"),
@@ -731,69 +1157,70 @@ class SentryDashboard(object):
                   Input("graph-maptime-time", "clickData"))
         def plot_maptime(vtarg, sliders, time_lims, hovermap, hovertime):
             """Render the map and timeline on the Map-time page."""
-            self.df = self.read_and_combine_dataframes(include_location=True)
-            df = self.df.copy()
-            df = df[(df.t >= time_lims[0]) & (df.t <= time_lims[1])]
+            self.df = self.read_latest()
+            df = self.rows_between(self.df, time_lims)
             
             # make sure the rendering options for the overhead colorbar are updated
-            slider_min = np.nanmin(df[vtarg])
+            value_min, value_max = self.get_range(vtarg, df)
+            slider_min = value_min
             if vtarg == "dORPdt":
                 slider_max = 0
             else:
-                slider_max = np.nanmax(df[vtarg])
+                slider_max = value_max
             
-            if sliders[0] >= slider_min and sliders[1] <= slider_max and sliders[0] < sliders[1]:
-                sliders = sliders
-            elif sliders[0] >= slider_min and sliders[0] < slider_max:
-                sliders = [sliders[0], slider_max]
-            elif sliders[1] <= slider_max and sliders[0] < sliders[1]:
-                sliders = [slider_min, sliders[1]]
-            else:
-                sliders = [slider_min, slider_max]
+            sliders = self.clamp_range(sliders, slider_min, slider_max)
             self.sliders[vtarg].value = sliders
-            self.sliders[vtarg].min = np.nanmin(df[vtarg])
-            self.sliders[vtarg].max = np.nanmax(df[vtarg])
-
-            # plot the overhead map
-            if vtarg is not None:
-                tfig = go.Scatter(x=df.index, y=df[vtarg], mode="lines")
-                mfig = go.Scatter(x=df.lon,
-                                  y=df.lat,
-                                  mode="markers",
-                                  marker=dict(size=5,
-                                              color=df[vtarg],
-                                              colorscale="Inferno",
-                                              cmin=sliders[0],
-                                              cmax=sliders[1],
-                                              colorbar=dict(thickness=20,
-                                                            x=-0.2,
-                                                            tickfont=dict(size=20))))
-            map_fig = [self.bathy_2dplot,
-                       self.vents_plot, self.moorings_plot, mfig]
-            time_fig = [tfig]
-
-            # add click-interface information
-            if hovertime is not None:
-                hdata = hovertime["points"][0]
-                loc = df[(df.index == hdata["x"])]
-                map_fig.append(go.Scatter(x=loc.lon,
-                                          y=loc.lat,
-                                          mode="markers",
-                                          marker=dict(size=20)))
-            if hovermap is not None:
-                hdata = hovermap["points"][0]
-                time = df[(df.lon == hdata["x"]) & (df.lat == hdata["y"])]
-                time_fig.append(go.Scatter(
-                    x=time.index, y=time[vtarg], mode="markers", marker=dict(size=10, color=['#EF553B'])))
-
-            # create the final map
-            final_map_fig = go.Figure(map_fig)
-            final_map_fig.update_yaxes(scaleanchor="x", scaleratio=1)
-            final_map_fig.update_layout(uirevision=True, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
-            final_time_fig = go.Figure(time_fig)
-            final_time_fig.update_layout(uirevision=True, showlegend=False, font=dict(
-                size=20), hoverlabel=dict(font_size=20))
+            self.sliders[vtarg].min = value_min
+            self.sliders[vtarg].max = value_max
+
+            # a colour change or a click only changes one of the figures, so
+            # the other is left as the page already has it
+            triggered = {item["prop_id"].split(".")[0] for item in ctx.triggered}
+            if triggered == {"maptime-slider"}:
+                patch = Patch()
+                patch["data"][3]["marker"]["cmin"] = sliders[0]
+                patch["data"][3]["marker"]["cmax"] = sliders[1]
+                return(no_update, patch)
+            final_time_fig = final_map_fig = no_update
+
+            # plot the timeline, with any point clicked on the map
+            if triggered != {"graph-maptime-time"}:
+                time_fig = [go.Scattergl(x=df.index, y=df[vtarg], mode="lines")]
+                if hovermap is not None:
+                    hdata = hovermap["points"][0]
+                    time = df[(df.lon == hdata["x"]) & (df.lat == hdata["y"])]
+                    time_fig.append(go.Scattergl(
+                        x=time.index, y=time[vtarg], mode="markers", marker=dict(size=10, color=['#EF553B'])))
+                final_time_fig = go.Figure(time_fig)
+                final_time_fig.update_layout(uirevision=True, showlegend=False, font=dict(
+                    size=20), hoverlabel=dict(font_size=20))
+
+            # plot the overhead map, with any time clicked on the timeline
+            if triggered != {"graph-maptime-map"}:
+                mfig = go.Scattergl(x=df.lon,
+                                    y=df.lat,
+                                    mode="markers",
+                                    marker=dict(size=5,
+                                                color=df[vtarg],
+                                                colorscale="Inferno",
+                                                cmin=sliders[0],
+                                                cmax=sliders[1],
+                                                colorbar=dict(thickness=20,
+                                                              x=-0.2,
+                                                              tickfont=dict(size=20))))
+                map_fig = [self.bathy_2dplot,
+                           self.vents_plot, self.moorings_plot, mfig]
+                if hovertime is not None:
+                    hdata = hovertime["points"][0]
+                    loc = df[(df.index == hdata["x"])]
+                    map_fig.append(go.Scattergl(x=loc.lon,
+                                                y=loc.lat,
+                                                mode="markers",
+                                                marker=dict(size=20)))
+                final_map_fig = go.Figure(map_fig)
+                final_map_fig.update_yaxes(scaleanchor="x", scaleratio=1)
+                final_map_fig.update_layout(uirevision=True, font=dict(
+                    size=20), hoverlabel=dict(font_size=20))
 
             return(final_time_fig, final_map_fig)
 
@@ -805,12 +1232,13 @@ class SentryDashboard(object):
                   Input("current-slider-time", "value"))
         def update_current_time_slider(n, tlims):
             slide_max = tlims[-1]
-            self.df = self.read_and_combine_dataframes(include_location=True)
+            self.df = self.read_latest()
+            tmin, tmax = self.df.t.values[[0, -1]]  # the data is sorted by t
             if slide_max >= self.last_current_t:
-                self.last_current_t = np.nanmax(self.df.t)
-                return(np.nanmin(self.df.t), np.nanmax(self.df.t), [tlims[0], np.nanmax(self.df.t)])
+                self.last_current_t = tmax
+                return(tmin, tmax, [tlims[0], tmax])
             else:
-                return(np.nanmin(self.df.t), np.nanmax(self.df.t), tlims)
+                return(tmin, tmax, tlims)
 
         @callback(Output("current-rangeslider-slider", "children"),
                   Input("current-selection", "value"))
@@ -825,41 +1253,40 @@ class SentryDashboard(object):
                   Input("current-slider-time", "value"))
         def plot_ocean_currents(vtarg, sliders, time_lims):
             """Create the visualizations of ocean current from file."""
-            self.df = self.read_and_combine_dataframes(include_location=True)
-            df = self.df.copy()
-            df = df[(df.t >= time_lims[0]) & (df.t <= time_lims[1])]
+            self.df = self.read_latest()
+            df = self.rows_between(self.df, time_lims)
            
            # make sure the rendering options for the overhead colorbar are updated
-            slider_min = np.nanmin(df[vtarg])
+            value_min, value_max = self.get_range(vtarg, df)
+            slider_min = value_min
             if vtarg == "dORPdt":
                 slider_max = 0
             else:
-                slider_max = np.nanmax(df[vtarg])
-            if sliders[0] >= slider_min and sliders[1] <= slider_max and sliders[0] < sliders[1]:
-                sliders = sliders
-            elif sliders[0] >= slider_min and sliders[0] < slider_max:
-                sliders = [sliders[0], slider_max]
-            elif sliders[1] <= slider_max and sliders[0] < sliders[1]:
-                sliders = [slider_min, sliders[1]]
-            else:
-                sliders = [slider_min, slider_max]
+                slider_max = value_max
+            sliders = self.clamp_range(sliders, slider_min, slider_max)
             self.current_sliders[vtarg].value = sliders
-            self.current_sliders[vtarg].min = np.nanmin(df[vtarg])
-            self.current_sliders[vtarg].max = np.nanmax(df[vtarg])
+            self.current_sliders[vtarg].min = value_min
+            self.current_sliders[vtarg].max = value_max
             
-            quiv = ff.create_quiver(df.easting[::10], df.northing[::10], df.true_veast[::10],
-                                    df.true_vnorth[::10], scale=3000, arrow_scale=0.1, name='quiver', line_width=2)
-            quiv.add_trace(go.Scatter(x=df.easting,
-                                      y=df.northing,
-                                      mode="markers",
-                                      marker=dict(size=5,
-                                                  color=df[vtarg],
-                                                  colorscale="Inferno",
-                                                  cmin=sliders[0],
-                                                  cmax=sliders[1],
-                                                  colorbar=dict(thickness=20,
-                                                                x=-0.2,
-                                                                tickfont=dict(size=20)))))
+            # an arrow for every tenth row
+            arrows = df.iloc[::10]
+            lines_x, lines_y = quiver_lines(arrows.easting.values, arrows.northing.values,
+                                            arrows.true_veast.values, arrows.true_vnorth.values,
+                                            scale=3000, arrow_scale=0.1)
+            quiv = go.Figure(go.Scattergl(x=lines_x, y=lines_y, mode="lines",
+                                          name="quiver", line_width=2),
+                             layout=dict(hovermode="closest"))
+            quiv.add_trace(go.Scattergl(x=df.easting,
+                                        y=df.northing,
+                                        mode="markers",
+                                        marker=dict(size=5,
+                                                    color=df[vtarg],
+                                                    colorscale="Inferno",
+                                                    cmin=sliders[0],
+                                                    cmax=sliders[1],
+                                                    colorbar=dict(thickness=20,
+                                                                  x=-0.2,
+                                                                  tickfont=dict(size=20)))))
             quiv.add_trace(self.vents_m_plot)
             currentx_fig = go.Figure(go.Scatter(x=df.index,
                                       y=df.true_veast,
@@ -881,19 +1308,24 @@ class SentryDashboard(object):
 
     def _create_app_layout(self):
         """Creates the overall app layout."""
+        import dash
+        from dash import html, dcc
         layout = html.Div([html.Div([html.Div(dcc.Link(
             f"{page['name']}", href=page["relative_path"]), style={"display": "inline-block", "font-size": "24px", "padding": "1vh"}) for page in dash.page_registry.values()]), dash.page_container, ])
         return(layout)
 
     def _create_home_layout(self):
         """Create the small-timeseries viewer."""
+        from dash import html, dcc
         layout = html.Div(children=[html.H1(children="Sentry Dash Quickview", style={"textAlign": "center"}),
                                     dcc.Graph(id="graph-home-quickview"),
-                                    dcc.Interval(id="graph-home-update", interval=30*1000, n_intervals=0)])
+                                    dcc.Interval(id="graph-home-update", interval=30*1000, n_intervals=0),
+                                    dcc.Store(id="graph-home-sent")])
         return(layout)
 
     def _create_timeseries_layout(self):
         """Create the dashboard scene."""
+        from dash import html, dcc
         layout = html.Div([html.H1(children="Extended Timeseries Dashboard", style={"textAlign": "center"}),
                            dcc.Graph(id="graph-content-turbidity"),
                            dcc.Graph(id="graph-content-orp"),
@@ -904,11 +1336,13 @@ class SentryDashboard(object):
                            dcc.Graph(id="graph-content-temperature"),
                            dcc.Graph(id="graph-content-salinity"),
                            dcc.Graph(id="graph-content-oxygen"),
-                           dcc.Interval(id="graph-update", interval=30*1000, n_intervals=0)])
+                           dcc.Interval(id="graph-update", interval=30*1000, n_intervals=0),
+                           dcc.Store(id="graph-update-sent")])
         return(layout)
 
     def _create_SAGE_layout(self):
         """Creates a SAGE engineering page."""
+        from dash import html, dcc
         layout = html.Div([html.H1(children="SAGE Engineering Data", style={"textAlign": "center"}),
                            dcc.Graph(id="graph-content-sage"),
                            dcc.Interval(id="sage-graph-update", interval=30*1000, n_intervals=0)])
@@ -916,6 +1350,8 @@ class SentryDashboard(object):
 
     def _create_threshold_layout(self):
         """Create the ability to examine thresholds in a dashboard."""
+        from dash import html, dcc
+        import dash_bootstrap_components as dbc
         layout = dbc.Container([dbc.Row([html.Div(children=[html.H1(children="Simple Data Exploration Dashboard", style={"textAlign": "center"})]),
                                          html.Div(children=["Select x variable:",
                                                             dcc.Dropdown(self.keys, "Turbidity", id="x-axis-selection")]),
@@ -938,14 +1374,32 @@ class SentryDashboard(object):
 
     def _create_map_layout(self):
         """Create the map dashboard scene."""
+        from dash import html, dcc
         layout = html.Div([html.H1(children="Map Dashboard", style={"textAlign": "center"}),
                            html.Div(children=["Select variable to visualize:",
                                               dcc.Dropdown(self.keys, self.keys[0], id="map-selection")], style={"margin-top": 20}),
                            html.Div(children=[dcc.Graph(id="3d-map", style={'height': '90vh'})])])
         return(layout)
 
+    def _create_time_slider(self, slider_id):
+        """Creates a slider over the times of the data, open a day past the last.
+
+        Arguments:
+            slider_id (str): id of the slider
+        """
+        from dash import dcc
+        tmin, tmax = np.nanmin(self.df.t), np.nanmax(self.df.t)
+        return(dcc.RangeSlider(tmin,
+                               tmax,
+                               value=[tmin, tmax + 24 * 3600.],
+                               marks={int(date): {"label": str(pd.to_datetime(
+                                   date, unit="s"))} for date in self.df.t[::100]},
+                               id=slider_id))
+
     def _create_maptime_layout(self):
         """Create a map and timeline with hover capabilities."""
+        from dash import html, dcc
+        import dash_bootstrap_components as dbc
         layout = dbc.Container([dbc.Row([html.Div(children=[html.H1(children="Map-Time Dashboard", style={"textAlign": "center"}),
                                                             dcc.Interval(id="maptime-timer-update", interval=30*1000, n_intervals=0),]),
                                          html.Div(children=["Select variable:",
@@ -953,12 +1407,7 @@ class SentryDashboard(object):
                                          html.Div(children=["Set rendering scale:"], style={"margin-top": 20}),
                                          html.Div(id='maptime-rangeslider-slider'),
                                          html.Div(children=["Set times to display:",
-                                                            dcc.RangeSlider(np.nanmin(self.df.t),
-                                                                            np.nanmax(self.df.t),
-                                                                            value=[np.nanmin(self.df.t), np.nanmax(self.df.t)+24*3600.],
-                                                                            marks={int(date): {"label": str(pd.to_datetime(
-                                                                                date, unit="s"))} for each, date in enumerate(self.df.t[::100])},
-                                                                            id='maptime-slider-time')],
+                                                            self._create_time_slider('maptime-slider-time')],
                                                   style={"margin-top": 20})
                                          ]),
                                 dbc.Row([dbc.Col([dcc.Graph(id="graph-maptime-time", style={"width": "50vw", "height": "60vh"})]),
@@ -967,6 +1416,8 @@ class SentryDashboard(object):
 
     def _create_current_layout(self):
         """Create the layout for plotting current data over plotted points."""
+        from dash import html, dcc
+        import dash_bootstrap_components as dbc
         layout = dbc.Container([dbc.Row([html.Div(children=[html.H1(children="Ocean Currents Dashboard", style={"textAlign": "center"}),
                                                             dcc.Interval(id="current-timer-update", interval=30*1000, n_intervals=0)]),
                                          html.Div(children=["Select variable:",
@@ -974,14 +1425,7 @@ class SentryDashboard(object):
                                          html.Div(children=["Set rendering scale:"], style={"margin-top":20}),
                                          html.Div(id="current-rangeslider-slider"),
                                          html.Div(children=["Set times to display:",
-                                                            dcc.RangeSlider(np.nanmin(self.df.t),
-                                                                            np.nanmax(
-                                                                                self.df.t),
-                                                                            value=[
-                                                                                np.nanmin(self.df.t), np.nanmax(self.df.t) + 24 * 3600.],
-                                                                            marks={int(date): {"label": str(pd.to_datetime(
-                                                                                date, unit="s"))} for each, date in enumerate(self.df.t[::100])},
-                                                                            id='current-slider-time')],
+                                                            self._create_time_slider('current-slider-time')],
                                                   style={"margin-top": 20})
                                          ]),
                                 dbc.Row([dbc.Col([dcc.Graph(id="graph-content-currentmap", style={'width': '45vw', 'height': '60vh'})]),
@@ -989,16 +1433,249 @@ class SentryDashboard(object):
                                                   dcc.Graph(id="graph-content-currenty", style={'width': '50vw', 'height': '30vh'})]), ], style={'display': 'flex'})], fluid=True)
         return(layout)
 
+    def timeline_trace(self, y, markers=False, name=None):
+        """Plots a decimated WebGL trace of a column of the data, with positions on hover.
+
+        Arguments:
+            y (Series): values to plot, indexed like self.df
+            markers (bool): whether to mark each point as well
+            name (str): name of the trace, if any
+        """
+        import plotly.graph_objects as go
+        rows = decimate(y.values, self.timeline_points)
+        df = self.df.iloc[rows]
+        return(go.Scattergl(x=df.index, y=y.values[rows], name=name,
+                            mode="lines+markers" if markers else "lines",
+                            customdata=df[["lat", "lon", "Depth"]].values,
+                            hovertemplate=f"{df.index.name}=%{{x}}<br>{y.name}=%{{y}}<br>"
+                                          "lat=%{customdata[0]}<br>lon=%{customdata[1]}<br>"
+                                          "Depth=%{customdata[2]}<extra></extra>"))
+
+    def timeline_figure(self, y, markers=False):
+        """Plots a decimated WebGL timeline of a column of the data.
+
+        Arguments:
+            y (Series): values to plot, indexed like self.df
+            markers (bool): whether to mark each point as well
+        """
+        import plotly.graph_objects as go
+        fig = go.Figure(self.timeline_trace(y, markers), layout=self.timeline_layout)
+        fig.update_layout(xaxis_title=self.df.index.name, yaxis_title=y.name)
+        return(fig)
+
+    def stream_columns(self):
+        """Returns the columns plotted on the streamed timelines."""
+        columns = ["Turbidity", "ORP", "Depth", "potential_density", "spice",
+                   "Temperature", "Salinity", "Oxygen", "lat", "lon"]
+        if self.metsfile is not None:
+            columns.append("methane_mets")
+        return(columns)
+
+    def first_changed_time(self, old_df, new_df):
+        """Returns the earliest time of a row of old_df whose plotted values new_df changes.
+
+        Rows are compared on the streamed and quickview columns. If the rows
+        themselves differ (e.g., a late line sorted in), all of them count as
+        changed (-inf); if none changed, inf is returned.
+
+        Arguments:
+            old_df (DataFrame): combined data as last read
+            new_df (DataFrame): combined data as read now
+        """
+        old_t = old_df.t.values
+        if len(old_t) == 0:
+            return(np.inf)
+        columns = list(dict.fromkeys(self.stream_columns() + self.keys[:self.numkeys]))
+        head = new_df.iloc[:np.searchsorted(new_df.t.values, old_t[-1], side="right")]
+        if not np.array_equal(head.t.values, old_t) or \
+                not set(columns) <= set(old_df.columns):
+            return(-np.inf)
+        old = old_df[columns].to_numpy(dtype=float)
+        new = head[columns].to_numpy(dtype=float)
+        changed = ((old != new) & ~(np.isnan(old) & np.isnan(new))).any(axis=1)
+        if not changed.any():
+            return(np.inf)
+        return(old_t[np.argmax(changed)])
+
+    def sent_rows_changed(self, sent):
+        """Returns whether any rows already sent to a page have changed since.
+
+        Arguments:
+            sent (dict): what the page was sent, from sent_state
+        """
+        version = sent.get("version")
+        if version is None or version > self.data_version:
+            return(True)  # sent by an earlier run of the dashboard
+        changes = [self.data_changes[v] for v in range(version + 1, self.data_version + 1)]
+        return(min(changes, default=np.inf) <= sent["t"])
+
+    def sent_state(self, points):
+        """Returns what a page has been sent, to keep in its store.
+
+        Arguments:
+            points (int): most points in any of the page's timelines
+        """
+        return({"t": float(self.df.t.values[-1]), "version": self.data_version,
+                "points": points})
+
+    def rows_after(self, t):
+        """Returns the rows of the data after time t, as a slice."""
+        return(self.df.iloc[np.searchsorted(self.df.t.values, t, side="right"):])
+
+    def extend_timelines(self, new_df):
+        """Creates patches appending new rows to the streamed timelines.
+
+        Arguments:
+            new_df (DataFrame): combined rows not yet sent to the page
+
+        Returns a Patch for each timeline, in the order of the stream outputs.
+        """
+        from dash import Patch
+        if self.metsfile is not None:
+            methane = new_df.methane_mets
+        else:
+            methane = None  # the methane timeline is a flat placeholder
+        timelines = [new_df.Turbidity, new_df.ORP, -new_df.Depth, methane,
+                     -new_df.potential_density, new_df.spice,
+                     new_df.Temperature, new_df.Salinity, new_df.Oxygen]
+        x = new_df.index.tolist()
+        hover = new_df[["lat", "lon", "Depth"]].values.tolist()
+        patches = []
+        for y in timelines:
+            patch = Patch()
+            patch["data"][0]["x"].extend(x)
+            if y is None:
+                patch["data"][0]["y"].extend([0] * len(x))
+            else:
+                patch["data"][0]["y"].extend(y.tolist())
+                patch["data"][0]["customdata"].extend(hover)
+            patches.append(patch)
+        return(patches)
+
+    def get_mtimes(self):
+        """Returns the modification times of all of the data files."""
+        files = [self.datafile, self.sensorfile, self.metsfile,
+                 self.backscatterfile, self.usblfile, self.currentfile]
+        return(tuple(os.path.getmtime(f) for f in files if f is not None))
+
+    def rows_between(self, df, time_lims):
+        """Returns the rows of a time-sorted frame from time_lims[0] to time_lims[1].
+
+        The rows are found by binary search on t and returned as a slice,
+        without copying or masking the whole frame.
+
+        Arguments:
+            df (DataFrame): combined data, sorted by t
+            time_lims (list(float)): first and last times (s) to keep
+        """
+        t = df.t.values
+        start = np.searchsorted(t, time_lims[0], side="left")
+        stop = np.searchsorted(t, time_lims[1], side="right")
+        return(df.iloc[start:stop])
+
+    def clamp_range(self, sliders, low, high):
+        """Returns a slider range moved inside [low, high], or all of it if empty.
+
+        Arguments:
+            sliders (list(float)): lower and upper values of the range
+            low (float): smallest value allowed
+            high (float): largest value allowed
+        """
+        lower, upper = np.clip(sliders, low, high)
+        if lower < upper:
+            return([lower, upper])
+        return([low, high])
+
+    def read_latest(self):
+        """Returns the data with locations, re-reading it only once the data files have changed.
+
+        Shared by all of the callbacks, so that each change to the files is
+        parsed once however many pages and selections use it.
+        """
+        mtimes = self.get_mtimes()
+        if mtimes != self.data_mtimes:
+            self.data_mtimes = mtimes
+            df = self.read_and_combine_dataframes(include_location=True)
+            # note which rows already read have changed, for the pages sent them
+            self.data_version += 1
+            self.data_changes[self.data_version] = self.first_changed_time(self.df, df)
+            self.df = df
+        return(self.df)
+
     def get_bathy_data(self):
-        """Read in the data from a bathy file, if any."""
+        """Read in the data from a bathy file, if any.
+
+        The projected bathy is saved to a temporary file and re-used until
+        the bathy file changes.
+        """
+        names = ["lon", "lat", "depth", "northing", "easting"]
+        cache = self.bathy_cache_file("data")
+        if os.path.isfile(cache):
+            with np.load(cache) as data:
+                return(pd.DataFrame({name: data[name] for name in names}))
+
         bathy_df = pd.read_table(self.bathyfile, names=[
-            "lon", "lat", "depth"], sep=",").dropna()
+            "lon", "lat", "depth"], sep=",").dropna().reset_index(drop=True)
         eb, nb, _, _ = utm.from_latlon(
             bathy_df.lat.values, bathy_df.lon.values)
         bathy_df.loc[:, "northing"] = nb
         bathy_df.loc[:, "easting"] = eb
+        self.save_bathy_cache(cache, **{name: bathy_df[name].values for name in names})
         return bathy_df
 
+    def get_bathy_grid(self, num=200):
+        """Interpolates the bathy onto a regular lon/lat grid.
+
+        The cubic interpolation takes a while, so the grid is saved to a
+        temporary file and re-used until the bathy file changes.
+
+        Arguments:
+            num (int): number of grid points along each axis
+        """
+        from scipy.interpolate import griddata
+        cache = self.bathy_cache_file(f"grid_{num}")
+        if os.path.isfile(cache):
+            with np.load(cache) as grid:
+                return(grid["xlon"], grid["ylat"], grid["Z"])
+
+        lonmin, lonmax = self.bathy.lon.min(), self.bathy.lon.max()
+        latmin, latmax = self.bathy.lat.min(), self.bathy.lat.max()
+        xlon = np.linspace(lonmin, lonmax, num)
+        ylat = np.linspace(latmin, latmax, num)
+        Z = griddata((self.bathy.lon, self.bathy.lat),
+                     self.bathy.depth, tuple(np.meshgrid(xlon, ylat)), method="cubic")
+        self.save_bathy_cache(cache, xlon=xlon, ylat=ylat, Z=Z)
+        return(xlon, ylat, Z)
+
+    def bathy_cache_file(self, kind):
+        """Returns the temporary file for data derived from the bathy file.
+
+        The name is keyed on the bathy file's path, modification time, and
+        size, so a changed bathy file is never matched to an old cache.
+
+        Arguments:
+            kind (str): what is derived (e.g., "data")
+        """
+        stat = os.stat(self.bathyfile)
+        key = hashlib.md5(f"{os.path.abspath(self.bathyfile)},{stat.st_mtime_ns},"
+                          f"{stat.st_size}".encode()).hexdigest()
+        return(os.path.join(tempfile.gettempdir(), f"bathy_{kind}_{key}.npz"))
+
+    def save_bathy_cache(self, cache, **arrays):
+        """Saves arrays derived from the bathy file to its cache file.
+
+        Arguments:
+            cache (str): file from bathy_cache_file
+            arrays (array): arrays to save, by name
+        """
+        try:
+            # write then rename, so a partly written cache is never loaded
+            with open(cache + ".tmp", "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(cache + ".tmp", cache)
+        except OSError:
+            pass  # no cache this time; the data is still good
+
     def compute_potential_density_and_spice(self, salt, temp, depth, lat, lon):
         """Computed oceanographic measurements."""
         press = gsw.p_from_z(-depth, lat=lat)
@@ -1008,140 +1685,360 @@ class SentryDashboard(object):
         spice = gsw.spiciness2(SA=SA, CT=CT)
         return dp, spice
 
-    def read_and_combine_dataframes(self, include_location=False):
-        """Helper to constantly create new DF objects for plotting."""
-        # combine only the sentry and sensor dataframes
-        df = pd.read_csv(self.datafile, sep=",", header=None, names=[
-            "Time", "Oxygen", "Turbidity", "ORP", "Temperature", "Salinity", "Depth"])
+    def compute_changed_density_and_spice(self, key, t, salt, temp, depth, lat, lon):
+        """Computes potential density and spice, only for rows that have changed.
+
+        Rows with the same time and inputs as on the last call with the same
+        key re-use the values computed then; the rest are computed.
+
+        Arguments:
+            key (hashable): which set of rows these are (e.g., with locations)
+            t (array): sorted, unique times of the rows
+            salt, temp, depth, lat, lon (array): inputs to
+                compute_potential_density_and_spice
+        """
+        inputs = np.column_stack((salt, temp, depth, lat, lon)).astype(float)
+        pot_den = np.empty(len(t))
+        spice = np.empty(len(t))
+        changed = np.ones(len(t), dtype=bool)
+        cached = self.thermo_cache.get(key)
+        if cached is not None and len(cached[0]) > 0:
+            old_t, old_inputs, old_pot_den, old_spice = cached
+            pos = np.minimum(np.searchsorted(old_t, t), len(old_t) - 1)
+            same = (old_t[pos] == t) & ((old_inputs[pos] == inputs) |
+                                        (np.isnan(old_inputs[pos]) & np.isnan(inputs))).all(axis=1)
+            pot_den[same] = old_pot_den[pos[same]]
+            spice[same] = old_spice[pos[same]]
+            changed = ~same
+        if changed.any():
+            pot_den[changed], spice[changed] = self.compute_potential_density_and_spice(
+                *inputs[changed].T)
+        self.thermo_cache[key] = (t, inputs, pot_den, spice)
+        return(pot_den, spice)
+
+    def read_cached(self, path, reader):
+        """Returns reader(path), re-using the last result until the file changes.
+
+        Arguments:
+            path (str): file to read
+            reader (function): parses the file into a DataFrame, which callers
+                must not modify in place
+        """
+        stat = os.stat(path)
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self.file_cache.get(path)
+        if cached is None or cached[0] != version:
+            cached = (version, reader(path))
+            self.file_cache[path] = cached
+        return(cached[1])
+
+    def read_appended(self, path, reader):
+        """Returns reader(path) for a log that only has lines appended to it.
+
+        Only the lines appended since the last read are parsed. The last line
+        already parsed is parsed again with them, so that values computed from
+        the previous row (e.g., dORPdt) carry across, and its row dropped. A
+        log that was replaced, truncated, or rewritten is read from its start.
+
+        Arguments:
+            path (str): file to read
+            reader (function): parses a buffer of lines into a DataFrame with
+                a row per line, which callers must not modify in place
+        """
+        stat = os.stat(path)
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self.file_cache.get(path)
+        if cached is not None and cached["version"] == version:
+            return(cached["df"])
+
+        # re-read from the start if the file was replaced or truncated, or if
+        # some lines did not parse into rows (so the last line's row is unknown)
+        if cached is None or not cached["whole_rows"] or \
+                stat.st_ino != cached["version"][0] or stat.st_size < cached["end"]:
+            start = 0
+        else:
+            start = cached["last_start"]
+        with open(path, "rb") as f:
+            f.seek(start)
+            chunk = f.read(stat.st_size - start)
+            if start > 0 and not chunk.startswith(cached["last_line"]):
+                # rewritten in place, or replaced by a file that reused the inode
+                start = 0
+                f.seek(0)
+                chunk = f.read(stat.st_size)
+
+        # leave any partially written line for the next read
+        end = chunk.rfind(b"\n") + 1
+        num_lines = chunk.count(b"\n", 0, end)
+        if start == 0 and num_lines == 0:
+            return(reader(io.BytesIO(chunk)))
+        if start > 0 and num_lines == 1:
+            cached["version"] = version  # no new complete lines
+            return(cached["df"])
+
+        df = reader(io.BytesIO(chunk[:end]))
+        whole_rows = len(df) == num_lines
+        if start > 0:
+            df = pd.concat([cached["df"], df.iloc[1:]], ignore_index=True)
+        last_start = chunk.rfind(b"\n", 0, end - 1) + 1
+        self.file_cache[path] = {"version": version,
+                                 "df": df,
+                                 "whole_rows": whole_rows,
+                                 "last_start": start + last_start,
+                                 "last_line": chunk[last_start:end],
+                                 "end": start + end}
+        return(df)
+
+    def get_cached_stat(self, stat, key, compute):
+        """Returns compute(column key of the data), cached until the data is next re-read.
+
+        Arguments:
+            stat (str): name the result is cached under, with key
+            key (str): column of self.df
+            compute (function): computes the statistic from the column (Series)
+        """
+        if self.stats_df is not self.df:
+            self.stats_df = self.df
+            self.stats = {}
+        if (stat, key) not in self.stats:
+            self.stats[(stat, key)] = compute(self.df[key])
+        return(self.stats[(stat, key)])
+
+    def get_stats(self, key):
+        """Returns the mean and standard deviation of a column of the data."""
+        return(self.get_cached_stat("moments", key, lambda col: (col.mean(), col.std())))
+
+    def get_range(self, key, rows=None):
+        """Returns the smallest and largest values of a column of the data.
+
+        Arguments:
+            key (str): column of self.df
+            rows (DataFrame): rows of self.df to use, if not all of them
+        """
+        if rows is not None and len(rows) < len(self.df):
+            values = rows[key].to_numpy()
+            return(np.nanmin(values), np.nanmax(values))
+        return(self.get_cached_stat("range", key,
+                                    lambda col: (np.nanmin(col.values), np.nanmax(col.values))))
+
+    def get_color_range(self, key):
+        """Returns the 10th and 90th percentiles of a column of the data, to color it by."""
+        return(self.get_cached_stat("color_range", key,
+                                    lambda col: tuple(np.nanquantile(col.values, [0.1, 0.9]))))
+
+    def read_sentry_file(self, path):
+        """Reads in the sentry science data."""
+        names = ["Time", "Oxygen", "Turbidity", "ORP", "Temperature", "Salinity", "Depth"]
+        dtype = {name: "float32" for name in names[1:]}  # ample for the sensors
+        if pa_csv is not None:
+            df = read_csv_arrow(path, names, dtype=dtype, time_columns=["Time"])
+        else:
+            df = pd.read_csv(path, sep=",", header=None, names=names,
+                             dtype=dtype, parse_dates=["Time"])
         df["Depth"] = -df["Depth"]
-        df["Time"] = pd.to_datetime(df["Time"])
-        df.loc[:, "t"] = (
-            df["Time"] - pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
-        df.loc[:, "dORPdt"] = df.ORP.rolling(window=2).apply(lambda x: (x.iloc[-1] - x.iloc[0])/(2))
-        dORPdt_mask = df.dORPdt < 0.0
-        df.loc[:, "dORPdt_log"] = np.log(np.fabs(df.dORPdt * dORPdt_mask))
-        df["dORPdt_log"].replace([-np.inf, np.inf], -15, inplace=True)
-
-        merge_df = df
+        df.loc[:, "t"] = epoch_seconds(df["Time"])
+        dORPdt = df.ORP.to_numpy(dtype=float)
+        dORPdt = np.concatenate(([np.nan], np.diff(dORPdt) / 2))
+        # log of the falling rates; rising or flat rates are floored at -15
+        falling = dORPdt < 0.0
+        dORPdt_log = np.full_like(dORPdt, -15.)
+        np.negative(dORPdt, out=dORPdt_log, where=falling)
+        np.log(dORPdt_log, out=dORPdt_log, where=falling)
+        dORPdt_log[np.isnan(dORPdt)] = np.nan
+        df.loc[:, "dORPdt"] = dORPdt
+        df.loc[:, "dORPdt_log"] = dORPdt_log
+        return(df)
+
+    def read_sage_file(self, path):
+        """Reads in the SAGE methane sensor data."""
+        names = ["msgTime", "sensorTime", "onboardFileNum", "methane_ppm",
+                 "inletPressure_mbar", "inletTemperature_C", "housingPressure_mbar",
+                 "waterTemperature_C", "junctionTemperature_C", "junctionHumidity_per",
+                 "avgPDVolts", "inletHeaterState", "junctionHeaterState"]
+        usecols = [name for name in names
+                   if name == "sensorTime" or name in self.sage_columns]
+        dtype = {name: "float32" for name in names[3:11]}  # ample for the sensors
+        if pa_csv is not None:
+            dtype.update({"msgTime": "str", "sensorTime": "str", "onboardFileNum": "int64",
+                          "inletHeaterState": "int64", "junctionHeaterState": "int64"})
+            df = read_csv_arrow(path, names, dtype=dtype, usecols=usecols)
+        else:
+            df = pd.read_table(path, sep=",", header=None, names=names,
+                               usecols=usecols, dtype=dtype)
+        df["methaneTime"] = pd.to_datetime(
+            df["sensorTime"], format="%Y%m%dT%H%M%S", cache=True)
+        df.loc[:, "t"] = epoch_seconds(df["methaneTime"])
+        return(df)
+
+    def read_mets_file(self, path):
+        """Reads in the mets methane sensor data."""
+        df = pd.read_table(path,
+                           sep=",",
+                           header=None,
+                           names=["msgTimeMets",
+                                  "sensorTimeMets",
+                                  "instrument_name_mets",
+                                  "process_from_volts",
+                                  "temp_mets_count",
+                                  "temperature_mets",
+                                  "methane_mets_count",
+                                  "methane_mets"],
+                           # as text, since values may end in "?" (or not)
+                           dtype={"methane_mets": str})
+        df["methaneTimeMets"] = pd.to_datetime(df["sensorTimeMets"], cache=True)
+        df.loc[:, "t"] = epoch_seconds(df["methaneTimeMets"])
+        df["methane_mets"] = (pd.to_numeric(df["methane_mets"].str.strip(" ?"),
+                                            errors="coerce") * 1000.).astype(np.float32)
+        return(df)
+
+    def read_backscatter_file(self, path):
+        """Reads in the aux OBS backscatter data."""
+        # SDQ 102:2023-09-12T17:38:44 +0.0342 +0.0000 +0.0000 +0.0000???
+        df = pd.read_table(path,
+                           sep=",| ",
+                           engine="python",
+                           header=None,
+                           names=["msgDate",
+                                  "msgTime",
+                                  "sensorDate",
+                                  "sensorTime",
+                                  "turbidity_obs_5x",
+                                  "temp1",
+                                  "temp2",
+                                  "temp3"],
+                           dtype={"turbidity_obs_5x": "float32"})  # temps may end in "?"
+        df["sensorTimeObs"] = df["sensorDate"].str.cat(df["sensorTime"], sep=" ")
+        df["TimeObs"] = pd.to_datetime(df["sensorTimeObs"], cache=True)
+        df.loc[:, "t"] = epoch_seconds(df["TimeObs"])
+        return(df)
+
+    def read_usbl_file(self, path):
+        """Reads in the usbl nav data."""
+        names = ["timestamp", "lon", "lat", "depth_usbl"]
+        dtype = {"depth_usbl": "float32"}  # positions keep float64
+        if pa_csv is not None:
+            df = read_csv_arrow(path, names, dtype=dtype, time_columns=["timestamp"])
+        else:
+            df = pd.read_table(path, sep=",", header=None, names=names,
+                               parse_dates=["timestamp"], dtype=dtype)
+        df.loc[:, "usblTime"] = df["timestamp"]
+        df.loc[:, "t"] = epoch_seconds(df["usblTime"])
+        return(df)
+
+    def merge_latest(self, df, other):
+        """Adds to each row of df the latest row of other at or before its time.
+
+        Arguments:
+            df (DataFrame): rows to add to, sorted by t
+            other (DataFrame): rows to match by t; those without a time are dropped,
+                as are all but the first of those with the same time
+        """
+        if other.t.dtype != df.t.dtype:
+            other = other.dropna(subset=["t"]).astype({"t": df.t.dtype})
+        if not other.t.is_monotonic_increasing:
+            other = other.sort_values(by="t", kind="stable")
+        # of rows with the same time, the first is used
+        t = other.t.values
+        if len(t) > 1 and not (t[1:] != t[:-1]).all():
+            other = other[np.concatenate(([True], t[1:] != t[:-1]))]
+        return(pd.merge_asof(df, other, on="t"))
+
+    def read_current_file(self, path):
+        """Reads in the ocean current data."""
+        return(pd.read_csv(path, dtype={"true_veast": "float32", "true_vnorth": "float32"}))
+
+    def read_and_combine_dataframes(self, include_location=False):
+        """Helper to constantly create new DF objects for plotting.
+
+        Only the lines appended to each file since the last call are parsed.
+        """
+        # match the other data onto the sentry data's times
+        merge_df = self.read_appended(self.datafile, self.read_sentry_file)
+        if merge_df.t.hasnans:
+            # lines without a time cannot be matched, and leave t as float
+            merge_df = merge_df.dropna(subset=["t"]).astype({"t": np.int64})
         sentry_data_index = merge_df.t.values[0]
+        if not merge_df.t.is_monotonic_increasing:
+            merge_df = merge_df.sort_values(by="t", kind="stable")
 
         # read in the methane sensor data
         if self.sensorfile is not None:
-            self.sensor = pd.read_table(self.sensorfile,
-                                        sep=",",
-                                        header=None,
-                                        names=["msgTime",
-                                               "sensorTime",
-                                               "onboardFileNum",
-                                               "methane_ppm",
-                                               "inletPressure_mbar",
-                                               "inletTemperature_C",
-                                               "housingPressure_mbar",
-                                               "waterTemperature_C",
-                                               "junctionTemperature_C",
-                                               "junctionHumidity_per",
-                                               "avgPDVolts",
-                                               "inletHeaterState",
-                                               "junctionHeaterState"])
-            self.sensor["methaneTime"] = pd.to_datetime(
-                self.sensor["sensorTime"], format="%Y%m%dT%H%M%S")
-            self.sensor.loc[:, "t"] = (self.sensor["methaneTime"] -
-                                       pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
+            self.sensor = self.read_appended(self.sensorfile, self.read_sage_file)
 
             # interpolate the methane sensor data onto the sentry data
-            merge_df = merge_df.merge(self.sensor, how="outer", on="t")
+            merge_df = self.merge_latest(merge_df, self.sensor)
         else:
             pass
         
         if self.metsfile is not None:
-            self.mets = pd.read_table(self.metsfile,
-                                        sep=",",
-                                        header=None,
-                                        names=["msgTimeMets",
-                                               "sensorTimeMets",
-                                               "instrument_name_mets",
-                                               "process_from_volts",
-                                               "temp_mets_count",
-                                               "temperature_mets",
-                                               "methane_mets_count",
-                                               "methane_mets"])
-            self.mets["methaneTimeMets"] = pd.to_datetime(self.mets["sensorTimeMets"])
-            self.mets.loc[:, "t"] = (self.mets["methaneTimeMets"] -
-                                       pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
-            self.mets["methane_mets"] = self.mets.apply(lambda x: float(x.methane_mets.strip(" ").strip("?"))*1000., axis=1)
+            self.mets = self.read_appended(self.metsfile, self.read_mets_file)
 
             # interpolate the methane sensor data onto the sentry data
-            merge_df = merge_df.merge(self.mets[["t", "methane_mets"]], how="outer", on="t")
+            merge_df = self.merge_latest(merge_df, self.mets[["t", "methane_mets"]])
         else:
             pass
             
         if self.backscatterfile is not None:
-            # SDQ 102:2023-09-12T17:38:44 +0.0342 +0.0000 +0.0000 +0.0000???
-            self.backscatter = pd.read_table(self.backscatterfile,
-                                        sep=",| ",
-                                        engine="python",
-                                        header=None,
-                                        names=["msgDate",
-                                               "msgTime",
-                                               "sensorDate",
-                                               "sensorTime",
-                                               "turbidity_obs_5x",
-                                               "temp1",
-                                               "temp2",
-                                               "temp3"])
-            self.backscatter["sensorTimeObs"] = self.backscatter.apply(lambda x: f"{x.sensorDate} {x.sensorTime}",axis=1)
-            self.backscatter["TimeObs"] = pd.to_datetime(self.backscatter["sensorTimeObs"])
-            self.backscatter.loc[:, "t"] = (self.backscatter["TimeObs"] -
-                                       pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
+            self.backscatter = self.read_appended(self.backscatterfile,
+                                                  self.read_backscatter_file)
 
             # interpolate the methane sensor data onto the sentry data
-            merge_df = merge_df.merge(self.backscatter[["t", "turbidity_obs_5x"]], how="outer", on="t")
+            merge_df = self.merge_latest(merge_df, self.backscatter[["t", "turbidity_obs_5x"]])
         else:
             pass
 
         if include_location is True and self.usblfile is not None:
             # include the usbl location information
-            self.usbl = pd.read_table(self.usblfile, sep=",", header=None, names=[
-                "timestamp", "lon", "lat", "depth_usbl"])
-            self.usbl.loc[:, "usblTime"] = pd.to_datetime(
-                self.usbl["timestamp"])
-            self.usbl.loc[:, "t"] = (
-                self.usbl["usblTime"] - pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
-            merge_df = merge_df.merge(self.usbl, how="outer", on="t")
+            self.usbl = self.read_appended(self.usblfile, self.read_usbl_file)
+            merge_df = self.merge_latest(merge_df, self.usbl)
         else:
-            merge_df.loc[:, "lat"] = np.zeros_like(merge_df.t)
-            merge_df.loc[:, "lon"] = np.zeros_like(merge_df.t)
-            merge_df.loc[:, "depth_usbl"] = np.zeros_like(merge_df.t)
+            # assign rather than set in place, as merge_df may be cached
+            merge_df = merge_df.assign(lat=0, lon=0, depth_usbl=0)
 
         if self.currentfile is not None:
-            df = pd.read_csv(self.currentfile,
-                             sep=",")
+            df = self.read_cached(self.currentfile, self.read_current_file)
             df = df[(df.t > merge_df.t.values[0]) &
                     (df.t < merge_df.t.values[-1])]
-            merge_df = merge_df.merge(df, how="outer", on="t")
-
-        # index by time for consistency
-        merge_df = merge_df.sort_values(by="t")
-        merge_df = merge_df.drop_duplicates(subset=["t"], keep="first")
-        merge_df = merge_df[merge_df.t >= sentry_data_index]
+            merge_df = self.merge_latest(merge_df, df)
+
+        # index by time for consistency, dropping any rows before the first
+        # sentry line and all but the first row of each time
+        t = merge_df.t.values
+        keep = t >= sentry_data_index
+        keep[1:] &= t[1:] != t[:-1]
+        if not keep.all():
+            merge_df = merge_df[keep]
         merge_df.loc[:, "Global_Time"] = pd.to_datetime(
             merge_df["t"], unit="s")
         merge_df = merge_df.set_index("Global_Time")
-        merge_df = merge_df.interpolate(method="ffill")
-        pot_den, spice = self.compute_potential_density_and_spice(merge_df.Salinity.values,
-                                                                  merge_df.Temperature.values,
-                                                                  -merge_df.Depth.values,
-                                                                  merge_df.lat.values,
-                                                                  merge_df.lon.values)
-        merge_df.loc[:, "spice"] = spice
-        merge_df.loc[:, "potential_density"] = pot_den
+        merge_df = merge_df.ffill()
+        pot_den, spice = self.compute_changed_density_and_spice(include_location,
+                                                                merge_df.t.values,
+                                                                merge_df.Salinity.values,
+                                                                merge_df.Temperature.values,
+                                                                -merge_df.Depth.values,
+                                                                merge_df.lat.values,
+                                                                merge_df.lon.values)
+        columns = {"spice": spice, "potential_density": pot_den}
 
         if self.usblfile is not None:
-            merge_df = merge_df.dropna(subset=["lat", "lon"])
+            located = merge_df[["lat", "lon"]].notna().all(axis=1).values
+            if not located.all():
+                merge_df = merge_df[located]
+                columns = {name: values[located] for name, values in columns.items()}
             easting, northing, _, _ = utm.from_latlon(
                 merge_df.lat.values, merge_df.lon.values)
-            merge_df.loc[:, "northing"] = northing
-            merge_df.loc[:, "easting"] = easting
+            columns.update(northing=northing, easting=easting)
+
+        # add the computed columns together, rather than one copy at a time
+        merge_df = merge_df.assign(**columns)
+
+        # measurements need no more than float32; times and positions keep
+        # float64, as does potential density, whose anomalies are near
+        # float32's spacing
+        measured = [col for col in merge_df.select_dtypes("float64").columns
+                    if col not in ("t", "lat", "lon", "northing", "easting", "potential_density")]
+        merge_df = merge_df.astype({col: np.float32 for col in measured})
 
         return(merge_df)  # return the single, combined dataframe
 
@@ -1149,27 +2046,8 @@ class SentryDashboard(object):
         """Reads in a separate dataframe for sensor data."""
         # read in the methane sensor data
         if self.sensorfile is not None:
-            df = pd.read_table(self.sensorfile,
-                               sep=",",
-                               header=None,
-                               names=["msgTime",
-                                      "sensorTime",
-                                      "onboardFileNum",
-                                      "methane_ppm",
-                                      "inletPressure_mbar",
-                                      "inletTemperature_C",
-                                      "housingPressure_mbar",
-                                      "waterTemperature_C",
-                                      "junctionTemperature_C",
-                                      "junctionHumidity_per",
-                                      "avgPDVolts",
-                                      "inletHeaterState",
-                                      "jSunctionHeaterState"])
-            df["methaneTime"] = pd.to_datetime(
-                df["sensorTime"], format="%Y%m%dT%H%M%S")
-            df.loc[:, "t"] = (df["methaneTime"] -
-                              pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")
-            df = df.set_index("methaneTime")
-            return(df)
+            # shares the parsed log with read_and_combine_dataframes
+            df = self.read_appended(self.sensorfile, self.read_sage_file)
+            return(df.set_index("methaneTime"))
         else:
             return(None)
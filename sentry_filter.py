@@ -15,7 +15,8 @@ import os
 import yaml
 import argparse
 from filter_utils import filter_sentry_science_message, \
-    filter_sentry_status_message, filter_experimental_message, filter_supr_message, filter_mets_message, parse_sentry_payload, filter_obs_message
+    filter_sentry_status_message, filter_experimental_message, filter_supr_message, filter_mets_message, filter_obs_message, \
+    SentryPayloadParser, LogWriter
 
 # Globals which may need to change
 with open("port_config.yaml") as f:
@@ -54,6 +55,14 @@ if __name__ == '__main__':
                      filter_obs_message]
     queue_files = [os.path.join(
         filepath, f"{name}_{q}.txt") for q in queue_names]
+    queue_targets = dict(zip(queue_names, zip(queue_filters, queue_files)))
+    sentry_parser = SentryPayloadParser(STATUS_QUEUE,
+                                        SCIENCE_QUEUE,
+                                        METHANE_QUEUE,
+                                        SUPR_QUEUE,
+                                        METS_QUEUE,
+                                        OBS_QUEUE)
+    writer = LogWriter()
 
     # Now parse the file target by polling and parsing any new lines
     last_line = 0
@@ -75,32 +84,20 @@ if __name__ == '__main__':
             if len(line) == 0:
                 continue
 
-            msg_type, payload, timestamp = parse_sentry_payload(line,
-                                                                STATUS_QUEUE,
-                                                                SCIENCE_QUEUE,
-                                                                METHANE_QUEUE,
-                                                                SUPR_QUEUE,
-                                                                METS_QUEUE,
-                                                                OBS_QUEUE)
+            msg_type, payload, timestamp = sentry_parser.parse_sentry_payload(line)
 
             if msg_type is None:  # only care about certain queues
                 continue
 
-            # Get the matching queue index for message type
-            qidx = queue_names.index(msg_type)
+            # Get the matching filter and file for message type
+            queue_filter, queue_file = queue_targets[msg_type]
 
             # Filter the data
-            data = queue_filters[qidx](payload)
+            data = queue_filter(payload)
             if data is None:
                 continue
 
             # Log the filtered data
-            if os.path.isfile(queue_files[qidx]):
-                mode = "a"
-            else:
-                mode = "w+"
-            # print(timestamp)
-            # print(data)
-            with open(queue_files[qidx], mode) as rf:
-                rf.write(f"{timestamp+','+data}\n")
-                rf.flush()
+            writer.write(queue_file,
+                         (",".join((timestamp, data)) + "\n").encode())
+        writer.flush()
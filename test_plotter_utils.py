@@ -0,0 +1,64 @@
+"""Tests for the log readers in plotter_utils."""
+
+import io
+
+import numpy as np
+
+from plotter_utils import FileTail, SentryDashboard
+
+
+def make_dashboard():
+    """Returns a dashboard without reading any files, to call its readers."""
+    return(SentryDashboard.__new__(SentryDashboard))
+
+
+def test_read_mets_file_strips_question_marks():
+    lines = (b"2023-08-20 12:00:07.026294,2023-08-20T12:00:05,METS,1,118,2.439,180, 0.06644?\n"
+             b"2023-08-20 12:00:15.593724,2023-08-20T12:00:13,METS,1,143,2.170,192, 0.04277?\n")
+    df = make_dashboard().read_mets_file(io.BytesIO(lines))
+    np.testing.assert_allclose(df.methane_mets, [66.44, 42.77], rtol=1e-6)
+
+
+def test_read_mets_file_chunk_without_question_marks():
+    # an appended chunk may have no "?" at all, so pandas would infer floats
+    lines = (b"2023-08-20 12:00:07.026294,2023-08-20T12:00:05,METS,1,118,2.439,180, 0.002\n"
+             b"2023-08-20 12:00:15.593724,2023-08-20T12:00:13,METS,1,143,2.170,192, 0.003\n")
+    df = make_dashboard().read_mets_file(io.BytesIO(lines))
+    np.testing.assert_allclose(df.methane_mets, [2., 3.], rtol=1e-6)
+    assert df.methane_mets.dtype == np.float32
+
+
+def test_read_appended_rereads_replaced_log(tmp_path):
+    path = tmp_path / "usbl.txt"
+    lines = [f"2023-08-20 12:00:{i:02d}.000000,-129.0,47.9,-{2000 + i}.0\n" for i in range(60)]
+    dashboard = make_dashboard()
+    dashboard.file_cache = {}
+    path.write_text("".join(lines[:10]))
+    assert len(dashboard.read_appended(str(path), dashboard.read_usbl_file)) == 10
+
+    # a new log at least as long as the old one, which may reuse the inode
+    path.unlink()
+    path.write_text("".join(lines[30:60]))
+    df = dashboard.read_appended(str(path), dashboard.read_usbl_file)
+    assert df.equals(dashboard.read_usbl_file(str(path)))
+
+
+def test_read_sentry_file_malformed_value_is_missing():
+    lines = (b"2023-08-20 12:00:07.118216,200.82,0.1014,50.00,2.095,34.503,2000.00\n"
+             b"2023-08-20 12:00:13.351480,199.46,0.1041,5x.40,2.055,34.500,2001.00\n"
+             b"2023-08-20 12:00:22.886611,200.55,0.1033,50.80,2.079,34.503,2002.00\n")
+    df = make_dashboard().read_sentry_file(io.BytesIO(lines))
+    assert len(df) == 3
+    assert np.isnan(df.ORP[1])
+    np.testing.assert_allclose(df.Depth, [-2000., -2001., -2002.])
+
+
+def test_file_tail_malformed_value_is_missing(tmp_path):
+    path = tmp_path / "loc.txt"
+    path.write_text("2023-08-20 12:00:00,1.5,2\n"
+                    "2023-08-20 12:00:01,x,3\n"
+                    "2023-08-2x 12:00:02,4,5\n")
+    data = FileTail(str(path)).read([0, 1, 2], parse_dates=[0])
+    assert np.isnat(data[0][2])
+    np.testing.assert_array_equal(data[1], [1.5, np.nan, 4.])
+    np.testing.assert_array_equal(data[2], [2., 3., 5.])
@@ -13,7 +13,7 @@ Contact: {geflaspo, vpreston}@mit.edu
 import os
 import yaml
 import argparse
-from filter_utils import parse_usbl_payload
+from filter_utils import UsblPayloadParser
 
 # Get the USBL string IDs for each of the targets
 with open("port_config.yaml") as f:
@@ -41,6 +41,7 @@ if __name__ == '__main__':
     raw_file = parse.target
     queue_files = [os.path.join(filepath, f"{name}_{q}.txt")
                    for q in TARGET_NAMES]
+    usbl_parser = UsblPayloadParser(queue_files, TARGET_IDS)
 
     # Now parse the file target by polling and parsing any new lines
     last_line = 0
@@ -50,8 +51,8 @@ if __name__ == '__main__':
             continue
 
         # Convert raw file to various processed files
-        f = open(raw_file, "r").read()
-        lines = f.split("\n")
+        f = open(raw_file, "rb").read()
+        lines = f.split(b"\n")
         if last_line == len(lines)-1:  # get latest lines
             continue
         parse_lines = lines[last_line:]
@@ -59,9 +60,7 @@ if __name__ == '__main__':
 
         # Populate data
         for line in parse_lines:
-            # print(line)
             if len(line) == 0:
                 continue
-            parse_usbl_payload(line,
-                               queue_files,
-                               TARGET_IDS)
+            usbl_parser.parse_usbl_payload(line)
+        usbl_parser.flush()